@@ -4,30 +4,84 @@ Base MCP Server class with common functionality
 """
 
 import asyncio
+import contextlib
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Awaitable, Dict, Any, List, Optional
 
 from mcp.server import Server
-from mcp.server.models import InitializationOptions
-from mcp.server.stdio import stdio_server
 from mcp.types import CallToolResult, TextContent, Tool
 
+from utils.concurrency import AdmissionController, ToolLimits
 from utils.config import config_manager
+from utils.http_client import create_http_client
 from utils.logging_setup import setup_logging
+from utils.metrics import MetricsRegistry
+from utils.pagination import CursorPaginator
+from utils.rate_limit import RateLimitedError, TokenBucket
+from utils.serialization import dumps
+from utils.tool_cache import CachePolicy, ToolResultCache
 
 class BaseMCPServer(ABC):
     """Base class for MCP servers with common functionality"""
 
+    # Keyword arguments for create_http_client, e.g. {"http2": True}
+    http_client_options: Dict[str, Any] = {}
+
+    # Tool name -> CachePolicy for tools whose results may be memoized,
+    # e.g. {"search_news": CachePolicy(ttl=60, key_args=["query"])}
+    tool_cache_policies: Dict[str, CachePolicy] = {}
+
+    # Tool name -> ToolLimits for tools that need their own concurrency
+    # limit or deadline; every tool also shares the global MCP_MAX_* limits
+    tool_limits: Dict[str, ToolLimits] = {}
+
     def __init__(self, server_name: str, version: str = "1.0.0"):
         self.server_name = server_name
         self.version = version
-        self.server = Server(server_name)
+        self.server = Server(server_name, version=version)
         self.logger = setup_logging(server_name=server_name)
+        self._http_client = None
+        self._http_client_owner = None
 
         # Load configuration
         config_manager.load_env()
 
+        # None unless ENABLE_METRICS is set, so the disabled path is one check per call
+        self.metrics = None
+        if config_manager.get_env_var("ENABLE_METRICS", "false").lower() == "true":
+            self.metrics = MetricsRegistry(server_name)
+        self._metrics_tasks: List[asyncio.Task] = []
+        self._metrics_server = None
+
+        self.tool_cache = None
+        if self.tool_cache_policies and config_manager.get_env_var("MCP_TOOL_CACHE_ENABLED", "true").lower() == "true":
+            cache_root = Path(config_manager.get_env_var("MCP_TOOL_CACHE_DIR", "cache/tools"))
+            self.tool_cache = ToolResultCache(self.tool_cache_policies, str(cache_root / server_name))
+
+        self.admission = AdmissionController(
+            self.tool_limits,
+            max_concurrent=int(config_manager.get_env_var("MCP_MAX_CONCURRENT_CALLS", "16")),
+            max_queue=int(config_manager.get_env_var("MCP_MAX_QUEUED_CALLS", "32")),
+            default_timeout=float(config_manager.get_env_var("MCP_TOOL_TIMEOUT", "120")) or None
+        )
+        # Result encoding, see create_json_result
+        self.compact_results = config_manager.get_env_var("MCP_RESULT_COMPACT", "true").lower() == "true"
+        self.structured_results = config_manager.get_env_var("MCP_STRUCTURED_CONTENT", "true").lower() == "true"
+        self.json_backend = config_manager.get_env_var("MCP_JSON_BACKEND", "auto").lower()
+        self.paginator = CursorPaginator(ttl=float(config_manager.get_env_var("MCP_CURSOR_TTL", "600")))
+
+        # One bucket per process, shared by every client and session
+        self.rate_limiter = None
+        if config_manager.get_env_var("MCP_RATE_LIMIT_ENABLED", "true").lower() == "true":
+            burst = config_manager.get_env_var("MCP_RATE_LIMIT_BURST", "")
+            self.rate_limiter = TokenBucket(
+                float(config_manager.get_env_var("MCP_RATE_LIMIT_REQUESTS_PER_MINUTE", "60")),
+                burst=int(burst) if burst else None
+            )
+
         # Setup handlers
         self.setup_handlers()
 
@@ -46,26 +100,163 @@ class BaseMCPServer(ABC):
 
         @self.server.list_tools()
         async def list_tools() -> List[Tool]:
-            return self.get_tools()
+            tools = self.get_tools()
+            if self.metrics is not None:
+                tools = tools + [self._server_stats_tool()]
+            return tools
 
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
+            if self.metrics is None:
+                try:
+                    return await self.dispatch_tool_call(name, arguments)
+                except RateLimitedError as e:
+                    return self.create_error_result(str(e))
+            if name == "server_stats":
+                return self._server_stats()
+
+            started = time.perf_counter()
             try:
-                return await self.handle_tool_call(name, arguments)
-            except Exception as e:
-                self.logger.error(f"Error calling tool {name}: {e}")
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Error: {str(e)}")],
-                    isError=True
-                )
+                result = await self.dispatch_tool_call(name, arguments)
+            except RateLimitedError as e:
+                self.metrics.observe_rate_limited(name)
+                return self.create_error_result(str(e))
+            self.metrics.observe_tool(name, time.perf_counter() - started, error=bool(result.isError))
+            return result
+
+    def check_rate_limit(self, name: str):
+        """Take a token from the inbound rate limit or raise RateLimitedError
+
+        Rejects at once rather than queueing behind the bucket.
+        """
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            raise RateLimitedError(
+                f"Rate limit exceeded ({self.rate_limiter.rate * 60:g} calls per minute), "
+                f"retry in {self.rate_limiter.retry_after():.1f}s"
+            )
+
+    async def dispatch_tool_call(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Run a tool through the result cache, rate limit and admission limits
+
+        Cache hits skip the limits; concurrent identical calls share one
+        admitted execution and one rate limit token. Exceptions, including
+        overload and deadline errors, become error results, except
+        RateLimitedError, which the caller reports separately.
+        """
+        def admitted() -> Awaitable[CallToolResult]:
+            self.check_rate_limit(name)
+            return self.admission.run(name, lambda: self.handle_tool_call(name, arguments))
+
+        try:
+            if self.tool_cache is not None:
+                return await self.tool_cache.call(name, arguments, admitted)
+            return await admitted()
+        except RateLimitedError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error calling tool {name}: {e}")
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"Error: {str(e)}")],
+                isError=True
+            )
+
+    def _server_stats(self) -> CallToolResult:
+        stats = self.metrics.snapshot()
+        stats["admission"] = self.admission.stats()
+        if self.tool_cache is not None:
+            stats["tool_cache"] = self.tool_cache.stats()
+        return self.create_json_result(stats)
+
+    def _server_stats_tool(self) -> Tool:
+        return Tool(
+            name="server_stats",
+            description="Get per-tool call counts, error counts and latency percentiles, and upstream HTTP timings",
+            inputSchema={"type": "object", "properties": {}}
+        )
+
+    @property
+    def http_client(self):
+        """Pooled HTTP client owned by this server and reused across tool calls"""
+        if self._http_client_owner is not None:
+            return self._http_client_owner.http_client
+        if self._http_client is None:
+            self._http_client = create_http_client(**self.http_client_options)
+            if self.metrics is not None:
+                self.metrics.instrument(self._http_client)
+        return self._http_client
+
+    def share_http_client(self, owner: "BaseMCPServer"):
+        """Use owner's client instead of a private one (e.g. in a multi-server host)
+
+        Must be called before the first tool call. The client is still
+        created lazily, and closed by the owner rather than by this server.
+        """
+        self._http_client_owner = owner
+
+    async def startup(self):
+        """Hook run before serving, e.g. to resume persisted work"""
+
+    async def start_metrics_export(self):
+        """Start the Prometheus exporters configured by METRICS_FILE and METRICS_PORT"""
+        if self.metrics is None:
+            return
+
+        metrics_file = config_manager.get_env_var("METRICS_FILE", "")
+        if metrics_file:
+            interval = float(config_manager.get_env_var("METRICS_FILE_INTERVAL", "15"))
+            self._metrics_tasks.append(asyncio.create_task(self.metrics.write_periodically(metrics_file, interval)))
+
+        metrics_port = int(config_manager.get_env_var("METRICS_PORT", "0") or 0)
+        if metrics_port:
+            metrics_host = config_manager.get_env_var("METRICS_HOST", "127.0.0.1")
+            try:
+                self._metrics_server = await self.metrics.serve(metrics_host, metrics_port)
+                self.logger.info(f"Serving metrics on http://{metrics_host}:{metrics_port}/metrics")
+            except OSError as e:
+                # e.g. several servers started with the same port
+                self.logger.warning(f"Metrics port {metrics_port} unavailable: {e}")
+
+    async def aclose(self):
+        """Release resources held by the server"""
+        for task in self._metrics_tasks:
+            task.cancel()
+        if self._metrics_tasks:
+            await asyncio.gather(*self._metrics_tasks, return_exceptions=True)
+            self._metrics_tasks = []
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+            await self._metrics_server.wait_closed()
+            self._metrics_server = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     def validate_required_env_vars(self, required_vars: List[str]) -> bool:
         """Validate required environment variables"""
         return config_manager.validate_required_env_vars(required_vars)
 
-    async def run(self):
-        """Run the MCP server"""
-        self.logger.info(f"Starting {self.server_name} v{self.version}")
+    async def run(self, transport: Optional[str] = None):
+        """Run the MCP server over stdio or streamable HTTP (MCP_TRANSPORT)"""
+        transport = (transport or config_manager.get_env_var("MCP_TRANSPORT", "stdio")).lower()
+        if transport not in ("stdio", "http"):
+            raise ValueError(f"Unknown transport: {transport} (expected stdio or http)")
+
+        self.logger.info(f"Starting {self.server_name} v{self.version} ({transport})")
+
+        try:
+            await self.startup()
+            await self.start_metrics_export()
+            if transport == "http":
+                await self._run_http()
+            else:
+                await self._run_stdio()
+        finally:
+            await self.aclose()
+
+    async def _run_stdio(self):
+        from mcp.server import NotificationOptions
+        from mcp.server.models import InitializationOptions
+        from mcp.server.stdio import stdio_server
 
         async with stdio_server() as (read_stream, write_stream):
             await self.server.run(
@@ -75,18 +266,104 @@ class BaseMCPServer(ABC):
                     server_name=self.server_name,
                     server_version=self.version,
                     capabilities=self.server.get_capabilities(
-                        notification_options=None,
-                        experimental_capabilities=None
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={}
                     )
                 )
             )
 
+    async def _run_http(self):
+        """Serve streamable HTTP at /mcp on MCP_SERVER_HOST:MCP_SERVER_PORT
+
+        One process serves every client session, so the HTTP pool, caches,
+        tokens, queues and limits are shared between them. Responses stream
+        over SSE. On a loopback host, requests whose Host or Origin header
+        is not local are rejected to guard against DNS rebinding.
+        """
+        import uvicorn
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from mcp.server.transport_security import TransportSecuritySettings
+        from starlette.applications import Starlette
+        from starlette.middleware import Middleware
+        from starlette.middleware.cors import CORSMiddleware
+        from starlette.responses import JSONResponse
+        from starlette.routing import Route
+
+        host = config_manager.get_env_var("MCP_SERVER_HOST", "localhost")
+        port = int(config_manager.get_env_var("MCP_SERVER_PORT", "3000"))
+
+        security = None
+        if host in ("localhost", "127.0.0.1", "::1"):
+            security = TransportSecuritySettings(
+                enable_dns_rebinding_protection=True,
+                allowed_hosts=["localhost:*", "127.0.0.1:*", "[::1]:*"],
+                allowed_origins=["http://localhost:*", "http://127.0.0.1:*", "http://[::1]:*"]
+            )
+        sessions = StreamableHTTPSessionManager(
+            app=self.server,
+            security_settings=security,
+            session_idle_timeout=float(config_manager.get_env_var("MCP_SESSION_IDLE_TIMEOUT", "1800"))
+        )
+
+        class MCPEndpoint:
+            # A class instance, so Starlette routes raw ASGI calls to it
+            async def __call__(self, scope, receive, send):
+                await sessions.handle_request(scope, receive, send)
+
+        async def health(request):
+            return JSONResponse({"status": "ok", "server": self.server_name, "version": self.version})
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app):
+            async with sessions.run():
+                yield
+
+        middleware = []
+        if config_manager.get_env_var("MCP_ENABLE_CORS", "false").lower() == "true":
+            middleware.append(Middleware(
+                CORSMiddleware,
+                allow_origins=["*"],
+                allow_methods=["GET", "POST", "DELETE"],
+                allow_headers=["*"],
+                expose_headers=["Mcp-Session-Id"]
+            ))
+
+        app = Starlette(
+            routes=[
+                Route("/mcp", endpoint=MCPEndpoint(), methods=["GET", "POST", "DELETE"]),
+                Route("/health", endpoint=health, methods=["GET"])
+            ],
+            middleware=middleware,
+            lifespan=lifespan
+        )
+        self.logger.info(f"Serving MCP on http://{host}:{port}/mcp")
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+        await uvicorn.Server(config).serve()
+
     def create_success_result(self, message: str) -> CallToolResult:
         """Create a successful tool result"""
         return CallToolResult(
             content=[TextContent(type="text", text=message)]
         )
 
+    def create_json_result(self, data: Any, is_error: bool = False) -> CallToolResult:
+        """Create a tool result holding data as JSON text and structured content
+
+        The text is compact unless MCP_RESULT_COMPACT=false and is encoded
+        with orjson when available (MCP_JSON_BACKEND). Structured content is
+        attached unless MCP_STRUCTURED_CONTENT=false; it must be an object,
+        so other values are wrapped as {"result": data}.
+        """
+        text = dumps(data, compact=self.compact_results, backend=self.json_backend)
+        structured = None
+        if self.structured_results:
+            structured = data if isinstance(data, dict) else {"result": data}
+        return CallToolResult(
+            content=[TextContent(type="text", text=text)],
+            structuredContent=structured,
+            isError=is_error
+        )
+
     def create_error_result(self, error_message: str) -> CallToolResult:
         """Create an error tool result"""
         return CallToolResult(
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: streaming feed parser vs. ET.fromstring(response.text)
+
+Usage: python scripts/benchmarks/bench_feed_parser.py [items] [limit]
+"""
+
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utils.feed_parser import FeedStreamParser
+
+CHUNK_SIZE = 64 * 1024
+ROUNDS = 5
+
+def build_rss(items: int) -> bytes:
+    """Build a synthetic RSS 2.0 document with ~1 KB per item"""
+    body = "人工智能 AI news body text. " * 40
+    parts = ['<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>bench</title>']
+    for i in range(items):
+        parts.append(
+            f"<item><title>Article {i}</title><link>https://example.com/{i}</link>"
+            f"<description>{body}</description><pubDate>Thu, 18 Sep 2025 08:00:00 GMT</pubDate></item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+def build_atom(items: int) -> bytes:
+    """Build a synthetic Atom document with ~1 KB per entry"""
+    body = "人工智能 AI news body text. " * 40
+    parts = ['<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>bench</title>']
+    for i in range(items):
+        parts.append(
+            f'<entry><title>Article {i}</title><link href="https://example.com/{i}"/>'
+            f"<summary>{body}</summary><updated>2025-09-18T08:00:00Z</updated></entry>"
+        )
+    parts.append("</feed>")
+    return "".join(parts).encode("utf-8")
+
+def legacy_parse(data: bytes, limit: int) -> int:
+    """The previous path: decode everything, build the full tree, then slice"""
+    root = ET.fromstring(data.decode("utf-8"))
+    return len(root.findall(".//item")[:limit])
+
+def streaming_parse(data: bytes, limit: int) -> int:
+    """Feed fixed-size chunks as they would arrive from the network"""
+    parser = FeedStreamParser("bench", limit)
+    count = 0
+    for offset in range(0, len(data), CHUNK_SIZE):
+        count += len(parser.feed(data[offset:offset + CHUNK_SIZE]))
+        if parser.done:
+            return count
+    return count + len(parser.close())
+
+def measure(func, data: bytes, limit: int):
+    """Return (best wall time in ms, peak traced memory in MB, items)"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        items = func(data, limit)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / (1024 * 1024), items
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    rss = build_rss(items)
+    atom = build_atom(items)
+    print(f"Feed size: RSS {len(rss) / 1e6:.1f} MB, Atom {len(atom) / 1e6:.1f} MB, {items} items")
+    print(f"{'case':<28}{'time (ms)':>12}{'peak (MB)':>12}{'items':>8}")
+
+    cases = [
+        (f"legacy rss, limit={limit}", legacy_parse, rss, limit),
+        (f"streaming rss, limit={limit}", streaming_parse, rss, limit),
+        ("legacy rss, all items", legacy_parse, rss, items),
+        ("streaming rss, all items", streaming_parse, rss, items),
+        ("streaming atom, all items", streaming_parse, atom, items),
+    ]
+    for label, func, data, case_limit in cases:
+        ms, peak, count = measure(func, data, case_limit)
+        print(f"{label:<28}{ms:>12.1f}{peak:>12.1f}{count:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one process per server vs. the single-process multi-server host
+
+Starts every server over stdio, waits until each one has answered
+initialize and list_tools, then reports the wall-clock cold start and the
+summed resident memory of the server processes (read from /proc, so this
+runs on Linux only).
+
+Usage: python scripts/benchmarks/bench_host.py [runs]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import statistics
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+RUN_SERVER = Path(__file__).resolve().parents[1] / "servers" / "run_server.py"
+SERVERS = ["feishu", "news", "weather", "jimeng"]
+STARTUP_TIMEOUT = 60
+
+# Placeholder credentials so servers that check them at startup come up;
+# nothing here makes a network call
+BENCH_ENV = {
+    "FEISHU_APP_ID": "bench",
+    "FEISHU_APP_SECRET": "bench",
+    "JIMENG_API_KEY": "bench"
+}
+
+def child_rss_kb() -> int:
+    """Sum VmRSS over this process's direct children"""
+    total = 0
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # The command name may contain spaces, ppid follows the closing paren
+            ppid = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+            if ppid != os.getpid():
+                continue
+            for line in (stat.parent / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+async def serve(target: str, ready: asyncio.Queue, done: asyncio.Event, devnull):
+    """Start one server, report its tool count, and keep it up until done is set"""
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(RUN_SERVER), target],
+        env={**os.environ, **BENCH_ENV},
+        cwd=os.getcwd()
+    )
+    # anyio scopes must be exited by the task that entered them, so each
+    # session lives in its own task for the whole measurement
+    async with stdio_client(params, errlog=devnull) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            await ready.put(len((await session.list_tools()).tools))
+            await done.wait()
+
+async def measure(targets):
+    """Return (ms until every target listed its tools, RSS in MB, tool count)"""
+    ready: asyncio.Queue = asyncio.Queue()
+    done = asyncio.Event()
+    with open(os.devnull, "w") as devnull:
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(serve(target, ready, done, devnull)) for target in targets]
+        counts = [await asyncio.wait_for(ready.get(), STARTUP_TIMEOUT) for _ in targets]
+        elapsed = (time.perf_counter() - started) * 1000
+        # Let the interpreters settle before sampling memory
+        await asyncio.sleep(0.5)
+        rss = child_rss_kb() / 1024
+        done.set()
+        await asyncio.gather(*tasks)
+    return elapsed, rss, sum(counts)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    cases = [
+        (f"{len(SERVERS)} processes", SERVERS),
+        ("1 host process", ["all"])
+    ]
+    print(f"{'case':<16}{'cold start (ms)':>18}{'RSS (MB)':>12}{'tools':>8}")
+    for label, targets in cases:
+        timings, memory = [], []
+        for _ in range(runs):
+            ms, rss, tools = asyncio.run(measure(targets))
+            timings.append(ms)
+            memory.append(rss)
+        print(f"{label:<16}{statistics.median(timings):>18.1f}{statistics.median(memory):>12.1f}{tools:>8}")
+
+if __name__ == "__main__":
+    main()
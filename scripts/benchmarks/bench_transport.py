@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stdio (one server process per client) vs. streamable HTTP (one shared process)
+
+Every client opens its own session and calls ``get_current_weather`` in a
+loop. Over stdio each client spawns a private weather server, as MCP hosts
+do today; over HTTP all clients share one server. Throughput and latency
+are measured after the sessions are initialized, so process start-up is
+not included. Without OPENWEATHER_API_KEY the tool returns mock data, so
+this measures transport and dispatch overhead rather than the upstream.
+
+Usage: python scripts/benchmarks/bench_transport.py [clients] [calls_per_client]
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import statistics
+import subprocess
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+RUN_SERVER = Path(__file__).resolve().parents[1] / "servers" / "run_server.py"
+TOOL = "get_current_weather"
+ARGUMENTS = {"location": "上海"}
+
+# The inbound rate limit would otherwise cap both cases at the same rate
+BENCH_ENV = {"MCP_RATE_LIMIT_ENABLED": "false"}
+
+async def drive(session: ClientSession, calls: int, start: asyncio.Event, latencies: list):
+    await start.wait()
+    for _ in range(calls):
+        started = time.perf_counter()
+        result = await session.call_tool(TOOL, ARGUMENTS)
+        latencies.append(time.perf_counter() - started)
+        if result.isError:
+            raise RuntimeError(result.content[0].text)
+
+async def stdio_client_task(calls, ready, start, latencies, devnull):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(RUN_SERVER), "weather"],
+        env={**os.environ, **BENCH_ENV},
+        cwd=os.getcwd()
+    )
+    async with stdio_client(params, errlog=devnull) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            ready.release()
+            await drive(session, calls, start, latencies)
+
+async def http_client_task(url, calls, ready, start, latencies):
+    async with streamablehttp_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            ready.release()
+            await drive(session, calls, start, latencies)
+
+async def run_clients(clients: int, make_task):
+    """Start every client, then release them together; return (seconds, latencies)"""
+    ready = asyncio.Semaphore(0)
+    start = asyncio.Event()
+    latencies: list = []
+    tasks = [asyncio.create_task(make_task(ready, start, latencies)) for _ in range(clients)]
+    for _ in range(clients):
+        await ready.acquire()
+    started = time.perf_counter()
+    start.set()
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started, latencies
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def wait_for_http(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up")
+
+async def bench_stdio(clients: int, calls: int):
+    with open(os.devnull, "w") as devnull:
+        return await run_clients(
+            clients, lambda ready, start, latencies: stdio_client_task(calls, ready, start, latencies, devnull)
+        )
+
+async def bench_http(clients: int, calls: int):
+    port = free_port()
+    env = {**os.environ, **BENCH_ENV, "MCP_SERVER_HOST": "127.0.0.1", "MCP_SERVER_PORT": str(port)}
+    process = subprocess.Popen(
+        [sys.executable, str(RUN_SERVER), "weather", "--http"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        await wait_for_http(f"http://127.0.0.1:{port}/health")
+        url = f"http://127.0.0.1:{port}/mcp"
+        return await run_clients(
+            clients, lambda ready, start, latencies: http_client_task(url, calls, ready, start, latencies)
+        )
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def report(label: str, clients: int, elapsed: float, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<8}{clients:>8}{len(latencies) / elapsed:>12.0f}"
+        f"{statistics.median(latencies) * 1000:>10.2f}{p95 * 1000:>10.2f}"
+    )
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"{clients} clients x {calls} {TOOL} calls")
+    print(f"{'case':<8}{'clients':>8}{'calls/s':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, bench in (("stdio", bench_stdio), ("http", bench_http)):
+        for n in sorted({1, clients}):
+            elapsed, latencies = asyncio.run(bench(n, calls))
+            report(label, n, elapsed, latencies)
+
+if __name__ == "__main__":
+    main()
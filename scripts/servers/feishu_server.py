@@ -3,49 +3,348 @@
 Refactored Feishu MCP Server
 """
 
+import os
 import json
-from typing import Dict, Any, List
+import time
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 import httpx
 from mcp.types import CallToolResult, TextContent, Tool
 
 from core.base_server import BaseMCPServer
+from utils.config import config_manager
+from utils.disk_cache import DiskCache
+from utils.http_client import create_http_client
+from utils.multipart import StreamingMultipart, iter_file
+from utils.outbox import DeliveryQueue, PermanentDeliveryError, RetryableError
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Feishu API error codes that are worth retrying
+RATE_LIMITED_CODES = {99991400}
+TOKEN_INVALID_CODES = {99991661, 99991663, 99991668}
+
+# Request body limits for message content, with some headroom
+TEXT_MESSAGE_LIMIT = 140 * 1024
+CARD_MESSAGE_LIMIT = 28 * 1024
+
+# Feishu rejects message images above 10 MB
+IMAGE_UPLOAD_LIMIT = 10 * 1024 * 1024
+
+RECEIVE_ID_PREFIXES = {"oc_": "chat_id", "ou_": "open_id", "on_": "union_id"}
+
+def infer_receive_id_type(receive_id: str) -> str:
+    """Guess the receive_id_type from the shape of a Feishu ID"""
+    if "@" in receive_id:
+        return "email"
+    return RECEIVE_ID_PREFIXES.get(receive_id[:3], "chat_id")
+
+def _pack(blocks: List[str], limit: int, overhead: int) -> List[List[str]]:
+    """Greedily group rendered blocks so each group stays under limit bytes
+
+    Block sizes are measured after JSON string escaping, since that is
+    how they end up in the request's ``content`` field.
+    """
+    groups: List[List[str]] = [[]]
+    size = overhead
+    for block in blocks:
+        block_size = len(json.dumps(block, ensure_ascii=False).encode("utf-8"))
+        if groups[-1] and size + block_size > limit:
+            groups.append([])
+            size = overhead
+        groups[-1].append(block)
+        size += block_size
+    return groups
+
+def render_news_text(news_items: List[Dict[str, Any]], date: str, limit: int = TEXT_MESSAGE_LIMIT) -> List[str]:
+    """Render a news brief as one or more plain text messages"""
+    blocks = []
+    for i, item in enumerate(news_items, 1):
+        lines = [f"{i}. **{item.get('title', 'No title')}**", f"   {item.get('summary', 'No summary')}"]
+        if item.get('source'):
+            lines.append(f"   来源: {item['source']}")
+        if item.get('url'):
+            lines.append(f"   链接: {item['url']}")
+        blocks.append("\n".join(lines) + "\n\n")
+
+    groups = _pack(blocks, limit, 256)
+    parts = []
+    for idx, group in enumerate(groups, 1):
+        suffix = f" ({idx}/{len(groups)})" if len(groups) > 1 else ""
+        parts.append(f"📰 AI新闻简报 - {date}{suffix}\n\n" + "".join(group))
+    return parts
+
+def render_news_card(news_items: List[Dict[str, Any]], date: str, limit: int = CARD_MESSAGE_LIMIT) -> List[str]:
+    """Render a news brief as one or more interactive card messages"""
+    blocks = []
+    for i, item in enumerate(news_items, 1):
+        title = item.get('title', 'No title')
+        lines = [f"**{i}. [{title}]({item['url']})**" if item.get('url') else f"**{i}. {title}**"]
+        lines.append(item.get('summary', 'No summary'))
+        if item.get('source'):
+            lines.append(f"来源: {item['source']}")
+        blocks.append(json.dumps(
+            {"tag": "div", "text": {"tag": "lark_md", "content": "\n".join(lines)}},
+            ensure_ascii=False
+        ))
+
+    groups = _pack(blocks, limit, 512)
+    parts = []
+    for idx, group in enumerate(groups, 1):
+        suffix = f" ({idx}/{len(groups)})" if len(groups) > 1 else ""
+        card = {
+            "config": {"wide_screen_mode": True},
+            "header": {
+                "template": "blue",
+                "title": {"tag": "plain_text", "content": f"📰 AI新闻简报 - {date}{suffix}"}
+            },
+            "elements": []
+        }
+        for element in group:
+            if card["elements"]:
+                card["elements"].append({"tag": "hr"})
+            card["elements"].append(json.loads(element))
+        parts.append(json.dumps(card, ensure_ascii=False))
+    return parts
 
 class FeishuAPI:
-    """Feishu API client"""
-
-    def __init__(self, app_id: str, app_secret: str):
+    """Feishu API client
+
+    Token and message requests share one pooled client. Concurrent token
+    refreshes are coalesced behind a lock, and once a token is obtained a
+    background task renews it ``refresh_margin`` seconds before expiry so
+    senders normally never wait on auth.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        client: Optional[httpx.AsyncClient] = None,
+        refresh_margin: float = 300,
+        image_cache: Optional[DiskCache] = None,
+        local_image_dir: Optional[str] = None
+    ):
         self.base_url = "https://open.feishu.cn/open-apis"
         self.app_id = app_id
         self.app_secret = app_secret
         self.access_token = None
         self.token_expires_at = None
+        self.refresh_margin = refresh_margin
+        self._client = client
+        self._token_lock = asyncio.Lock()
+        self._renewal_task: Optional[asyncio.Task] = None
+        # Maps "url:<source>" and "sha256:<digest>" to uploaded image keys
+        self.image_cache = image_cache
+        # The only directory local images may be uploaded from; None allows URLs only
+        self.local_image_dir = Path(local_image_dir).resolve() if local_image_dir else None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client, shared with the owning server when one is given"""
+        if self._client is None:
+            self._client = create_http_client(http2=True)
+        return self._client
+
+    def _token_valid(self) -> bool:
+        # Keep a small safety window in case background renewal is late
+        return bool(
+            self.access_token and self.token_expires_at
+            and time.time() < self.token_expires_at - 60
+        )
 
     async def get_access_token(self) -> str:
         """Get or refresh access token"""
-        if self.access_token and self.token_expires_at:
-            import time
-            if time.time() < self.token_expires_at - 300:
-                return self.access_token
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/auth/v3/tenant_access_token/internal",
-                json={"app_id": self.app_id, "app_secret": self.app_secret}
-            )
+        if self._token_valid():
+            return self.access_token
 
-            result = response.json()
-            if result.get("code") != 0:
-                raise Exception(f"Failed to get access token: {result.get('msg')}")
+        async with self._token_lock:
+            # Another caller may have refreshed while we waited
+            if not self._token_valid():
+                await self._refresh_token()
+            return self.access_token
 
-            self.access_token = result["tenant_access_token"]
-            self.token_expires_at = result.get("expire", 0) + int(datetime.now().timestamp())
+    def invalidate_token(self):
+        """Drop the cached token so the next call fetches a new one"""
+        # Keep token_expires_at so the renewal loop keeps its schedule
+        self.access_token = None
 
-            return self.access_token
+    async def _refresh_token(self):
+        await self._request_token()
+        self._schedule_renewal()
+
+    async def _request_token(self):
+        response = await self.client.post(
+            f"{self.base_url}/auth/v3/tenant_access_token/internal",
+            json={"app_id": self.app_id, "app_secret": self.app_secret}
+        )
+
+        result = response.json()
+        if result.get("code") != 0:
+            raise Exception(f"Failed to get access token: {result.get('msg')}")
+
+        self.access_token = result["tenant_access_token"]
+        self.token_expires_at = result.get("expire", 0) + int(datetime.now().timestamp())
+
+    def _schedule_renewal(self):
+        """Start the background renewal task if it is not already running"""
+        if self._renewal_task is None or self._renewal_task.done():
+            self._renewal_task = asyncio.create_task(self._renew_loop())
+
+    async def _renew_loop(self):
+        while True:
+            remaining = self.token_expires_at - time.time()
+            # Never spin when the token lifetime is shorter than the margin
+            await asyncio.sleep(max(remaining - self.refresh_margin, remaining / 2, 1))
+            try:
+                async with self._token_lock:
+                    await self._request_token()
+            except Exception as e:
+                logger.warning(f"Background token renewal failed, retrying in 30s: {e}")
+                await asyncio.sleep(30)
+
+    async def aclose(self):
+        """Stop background token renewal"""
+        if self._renewal_task is not None:
+            self._renewal_task.cancel()
+            try:
+                await self._renewal_task
+            except asyncio.CancelledError:
+                pass
+            self._renewal_task = None
+
+    def _cached_image_key(self, key: str) -> Optional[str]:
+        if self.image_cache is None:
+            return None
+        entry = self.image_cache.get(key)
+        return entry["image_key"] if entry else None
+
+    def _remember_image_key(self, image_key: str, digest: str, source: Optional[str] = None):
+        if self.image_cache is None:
+            return
+        self.image_cache.set(f"sha256:{digest}", {"image_key": image_key})
+        if source:
+            self.image_cache.set(f"url:{source}", {"image_key": image_key, "sha256": digest})
+
+    def _local_image_path(self, source: str) -> Path:
+        """Resolve a local image path, rejecting anything outside local_image_dir"""
+        path = Path(source).resolve()
+        if self.local_image_dir is None or not path.is_relative_to(self.local_image_dir):
+            raise PermissionError(f"Local images must be in {self.local_image_dir or 'an allowed directory'}: {source}")
+        if not path.is_file():
+            raise FileNotFoundError(f"Image not found: {source}")
+        return path
+
+    async def upload_image(self, source: str) -> Dict[str, Any]:
+        """Upload an image from a URL or local path and return its image_key
+
+        URLs are streamed straight from the download into the multipart
+        upload while being hashed, so the image is never held in memory.
+        Local files are hashed first, which lets identical content reuse an
+        earlier image_key without uploading again; URLs that were uploaded
+        before are answered from the cache without downloading. Local paths
+        must lie inside ``local_image_dir`` (the Jimeng image cache), so
+        callers cannot upload arbitrary files from the server's disk.
+        """
+        is_url = source.startswith(("http://", "https://"))
+        if is_url:
+            image_key = self._cached_image_key(f"url:{source}")
+            if image_key:
+                return {"image_key": image_key, "cached": True}
+            async with self.client.stream("GET", source) as response:
+                response.raise_for_status()
+                size = response.headers.get("Content-Length")
+                if response.headers.get("Content-Encoding"):
+                    # Decoded bytes will not match the transferred length
+                    size = None
+                content_type = response.headers.get("Content-Type", "application/octet-stream").split(";")[0]
+                filename = os.path.basename(response.url.path) or "image"
+                return await self._upload_image_stream(
+                    response.aiter_bytes(), filename, content_type,
+                    int(size) if size else None, source
+                )
 
-    async def send_message(self, receive_id: str, content: str, msg_type: str = "text") -> Dict[str, Any]:
-        """Send message to Feishu"""
+        path = self._local_image_path(source)
+        digest = hashlib.sha256()
+        async for chunk in iter_file(str(path)):
+            digest.update(chunk)
+        image_key = self._cached_image_key(f"sha256:{digest.hexdigest()}")
+        if image_key:
+            return {"image_key": image_key, "cached": True, "sha256": digest.hexdigest()}
+        return await self._upload_image_stream(
+            iter_file(str(path)), path.name, "application/octet-stream", path.stat().st_size
+        )
+
+    async def _upload_image_stream(
+        self,
+        chunks,
+        filename: str,
+        content_type: str,
+        size: Optional[int],
+        source: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if size is not None and size > IMAGE_UPLOAD_LIMIT:
+            raise ValueError(f"Image is {size} bytes, Feishu accepts at most {IMAGE_UPLOAD_LIMIT}")
+
+        digest = hashlib.sha256()
+        uploaded = 0
+
+        async def hashed():
+            nonlocal uploaded
+            async for chunk in chunks:
+                uploaded += len(chunk)
+                if uploaded > IMAGE_UPLOAD_LIMIT:
+                    raise ValueError(f"Image exceeds Feishu's {IMAGE_UPLOAD_LIMIT} byte limit")
+                digest.update(chunk)
+                yield chunk
+
+        body = StreamingMultipart(
+            {"image_type": "message"}, "image", filename, hashed(),
+            content_type=content_type, file_size=size
+        )
+        token = await self.get_access_token()
+        response = await self.client.post(
+            f"{self.base_url}/im/v1/images",
+            headers={"Authorization": f"Bearer {token}", **body.headers},
+            content=body
+        )
+
+        result = response.json()
+        if result.get("code") != 0:
+            if result.get("code") in TOKEN_INVALID_CODES:
+                self.invalidate_token()
+            raise Exception(f"Failed to upload image: {result.get('msg')}")
+
+        image_key = result["data"]["image_key"]
+        self._remember_image_key(image_key, digest.hexdigest(), source)
+        return {"image_key": image_key, "cached": False, "sha256": digest.hexdigest(), "bytes": uploaded}
+
+    async def send_image(self, receive_id: str, source: str) -> Dict[str, Any]:
+        """Upload an image (or reuse its cached key) and send it as an image message"""
+        upload = await self.upload_image(source)
+        result = await self.send_message(receive_id, json.dumps({"image_key": upload["image_key"]}), "image")
+        result["upload"] = upload
+        return result
+
+    async def send_message(
+        self,
+        receive_id: str,
+        content: str,
+        msg_type: str = "text",
+        receive_id_type: Optional[str] = None,
+        uuid: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send message to Feishu
+
+        Feishu drops a message whose ``uuid`` it has already seen within the
+        past hour, which makes retries of the same message safe.
+        """
         token = await self.get_access_token()
 
         headers = {
@@ -58,34 +357,115 @@ class FeishuAPI:
         payload = {
             "receive_id": receive_id,
             "msg_type": msg_type,
-            "content": json.dumps(message_content)
+            "content": json.dumps(message_content, ensure_ascii=False)
         }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/im/v1/messages",
-                headers=headers,
-                json=payload,
-                params={"receive_id_type": "chat_id"}
-            )
-
+        if uuid:
+            payload["uuid"] = uuid
+
+        response = await self.client.post(
+            f"{self.base_url}/im/v1/messages",
+            headers=headers,
+            json=payload,
+            params={"receive_id_type": receive_id_type or infer_receive_id_type(receive_id)}
+        )
+
+        # Gateway errors and throttling often come back without a JSON body
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableError(f"Feishu returned HTTP {response.status_code}")
+        try:
             return response.json()
+        except ValueError:
+            raise RetryableError(
+                f"Unreadable Feishu response (HTTP {response.status_code}): {response.text[:200]!r}"
+            ) from None
 
 class FeishuMCPServer(BaseMCPServer):
     """Refactored Feishu MCP Server"""
 
-    def __init__(self):
-        super().__init__("feishu-mcp-server")
+    # Token and message calls share one HTTP/2-capable pooled client
+    http_client_options = {"http2": True}
 
-        # Validate required environment variables
-        if not self.validate_required_env_vars(["FEISHU_APP_ID", "FEISHU_APP_SECRET"]):
-            raise ValueError("Missing required Feishu credentials")
+    REQUIRED_ENV_VARS = ["FEISHU_APP_ID", "FEISHU_APP_SECRET"]
 
-        # Initialize Feishu API
-        from utils.config import config_manager
-        app_id = config_manager.get_env_var("FEISHU_APP_ID")
-        app_secret = config_manager.get_env_var("FEISHU_APP_SECRET")
-        self.feishu = FeishuAPI(app_id, app_secret)
+    def __init__(self):
+        super().__init__("feishu-mcp-server")
+        # Built on first use; credentials are checked then, so the server
+        # can start and list its tools without them
+        self._feishu: Optional[FeishuAPI] = None
+        self._outbox: Optional[DeliveryQueue] = None
+
+    @property
+    def feishu(self) -> FeishuAPI:
+        if self._feishu is None:
+            if not self.validate_required_env_vars(self.REQUIRED_ENV_VARS):
+                raise ValueError("Missing required Feishu credentials")
+            image_cache = DiskCache(
+                config_manager.get_env_var("FEISHU_IMAGE_CACHE_DIR", "cache/feishu_images"),
+                ttl=30 * 86400,
+                max_entries=4096
+            )
+            self._feishu = FeishuAPI(
+                config_manager.get_env_var("FEISHU_APP_ID"),
+                config_manager.get_env_var("FEISHU_APP_SECRET"),
+                client=self.http_client,
+                image_cache=image_cache,
+                local_image_dir=config_manager.get_env_var("JIMENG_CACHE_DIR", "cache/jimeng")
+            )
+        return self._feishu
+
+    @property
+    def outbox(self) -> DeliveryQueue:
+        """Disk-spooled, rate-limited queue for outbound messages"""
+        if self._outbox is None:
+            limiter = None
+            if config_manager.get_env_var("MCP_RATE_LIMIT_ENABLED", "true").lower() == "true":
+                limiter = TokenBucket(float(config_manager.get_env_var("MCP_RATE_LIMIT_REQUESTS_PER_MINUTE", "60")))
+            self._outbox = DeliveryQueue(
+                config_manager.get_env_var("FEISHU_SPOOL_DIR", "data/feishu_outbox"),
+                self._deliver,
+                limiter=limiter,
+                workers=int(config_manager.get_env_var("FEISHU_SEND_WORKERS", "2")),
+                max_attempts=int(config_manager.get_env_var("FEISHU_SEND_MAX_ATTEMPTS", "5"))
+            )
+        return self._outbox
+
+    async def startup(self):
+        """Resume deliveries spooled by the previous run"""
+        spool_dir = Path(config_manager.get_env_var("FEISHU_SPOOL_DIR", "data/feishu_outbox"))
+        if all(config_manager.get_env_var(var) for var in self.REQUIRED_ENV_VARS) and any(spool_dir.glob("*.json")):
+            self.outbox.start()
+
+    async def aclose(self):
+        """Stop delivery workers and token renewal, then close the HTTP client"""
+        if self._outbox is not None:
+            await self._outbox.aclose()
+        if self._feishu is not None:
+            await self._feishu.aclose()
+        await super().aclose()
+
+    async def _deliver(self, payload: Dict[str, Any], delivery_id: str) -> Dict[str, Any]:
+        """Send one spooled message, classifying Feishu errors for the queue
+
+        The delivery id doubles as Feishu's uuid, so an attempt retried after
+        it actually went through is not shown to the recipient twice.
+        """
+        if payload["msg_type"] != "text":
+            try:
+                json.loads(payload["content"])
+            except ValueError as e:
+                raise PermanentDeliveryError(f"Invalid {payload['msg_type']} content: {e}") from None
+        result = await self.feishu.send_message(
+            payload["receive_id"], payload["content"], payload["msg_type"], uuid=delivery_id
+        )
+        code = result.get("code")
+        if code == 0:
+            return {"message_id": result.get("data", {}).get("message_id")}
+        if code in TOKEN_INVALID_CODES:
+            self.feishu.invalidate_token()
+            raise RetryableError(f"Token rejected ({code}): {result.get('msg')}")
+        if code in RATE_LIMITED_CODES:
+            raise RetryableError(f"Rate limited ({code}): {result.get('msg')}")
+        raise PermanentDeliveryError(f"Feishu error {code}: {result.get('msg')}")
 
     def get_tools(self) -> List[Tool]:
         """Return list of Feishu tools"""
@@ -105,11 +485,25 @@ class FeishuMCPServer(BaseMCPServer):
             ),
             Tool(
                 name="send_news_summary",
-                description="Send formatted news summary to group",
+                description="Send formatted news summary to one or more groups or users",
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "group_id": {"type": "string", "description": "Target group chat ID"},
+                        "recipients": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Chat IDs (oc_), open IDs (ou_), union IDs (on_) or emails"
+                        },
+                        "format": {"type": "string", "enum": ["text", "card"], "default": "text"},
+                        "wait_seconds": {
+                            "type": "number",
+                            "description": (
+                                "Wait up to this long for deliveries to finish before reporting; "
+                                "recipients still pending can be polled with get_delivery_status"
+                            ),
+                            "default": 5
+                        },
                         "news_items": {
                             "type": "array",
                             "items": {
@@ -124,7 +518,30 @@ class FeishuMCPServer(BaseMCPServer):
                         },
                         "date": {"type": "string", "description": "Date for the news summary"}
                     },
-                    "required": ["group_id", "news_items"]
+                    "required": ["news_items"]
+                }
+            ),
+            Tool(
+                name="send_feishu_image",
+                description="Upload an image (e.g. a Jimeng result URL) to Feishu and send it as an image message",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "receive_id": {"type": "string", "description": "Chat ID, open ID or email"},
+                        "image_url": {"type": "string", "description": "Image URL, or a local path inside the Jimeng image cache"}
+                    },
+                    "required": ["receive_id", "image_url"]
+                }
+            ),
+            Tool(
+                name="get_delivery_status",
+                description="Get the delivery status of a queued Feishu message, or a summary of the outbox",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "delivery_id": {"type": "string", "description": "Delivery ID returned when the message was queued"},
+                        "wait_seconds": {"type": "number", "description": "Wait up to this long for the delivery to finish", "default": 0}
+                    }
                 }
             )
         ]
@@ -135,6 +552,10 @@ class FeishuMCPServer(BaseMCPServer):
             return await self._send_message(arguments)
         elif name == "send_news_summary":
             return await self._send_news_summary(arguments)
+        elif name == "send_feishu_image":
+            return await self._send_image(arguments)
+        elif name == "get_delivery_status":
+            return await self._get_delivery_status(arguments)
         else:
             return self.create_error_result(f"Unknown tool: {name}")
 
@@ -145,51 +566,119 @@ class FeishuMCPServer(BaseMCPServer):
             message = args["message"]
             msg_type = args.get("message_type", "text")
 
-            result = await self.feishu.send_message(receive_id, message, msg_type)
+            delivery_id = self.outbox.enqueue({
+                "receive_id": receive_id,
+                "content": message,
+                "msg_type": msg_type
+            })
+            return self.create_success_result(f"Message queued. Delivery ID: {delivery_id}")
 
-            if result.get("code") == 0:
-                return self.create_success_result(
-                    f"Message sent successfully. Message ID: {result.get('data', {}).get('message_id')}"
-                )
-            else:
-                return self.create_error_result(f"Failed to send message: {result.get('msg')}")
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _send_image(self, args: Dict[str, Any]) -> CallToolResult:
+        """Upload an image now and queue the image message"""
+        try:
+            upload = await self.feishu.upload_image(args["image_url"])
+            delivery_id = self.outbox.enqueue({
+                "receive_id": args["receive_id"],
+                "content": json.dumps({"image_key": upload["image_key"]}),
+                "msg_type": "image"
+            })
+            return self.create_success_result(
+                f"Image queued. Delivery ID: {delivery_id}, image_key: {upload['image_key']}"
+                + (" (reused)" if upload["cached"] else "")
+            )
 
         except Exception as e:
             return self.create_error_result(str(e))
 
     async def _send_news_summary(self, args: Dict[str, Any]) -> CallToolResult:
-        """Send formatted news summary"""
+        """Send formatted news summary to every recipient
+
+        The brief is rendered once and split into parts under Feishu's size
+        limit; every (recipient, part) pair is queued at once, so the fan-out
+        is bounded by the outbox workers and rate limiter.
+        """
         try:
-            group_id = args["group_id"]
+            recipients = list(dict.fromkeys(args.get("recipients") or []))
+            if args.get("group_id") and args["group_id"] not in recipients:
+                recipients.insert(0, args["group_id"])
+            if not recipients:
+                return self.create_error_result("group_id or recipients is required")
+
             news_items = args["news_items"]
             date = args.get("date", datetime.now().strftime("%Y-%m-%d"))
 
-            # Format news summary
-            summary_text = f"📰 AI新闻简报 - {date}\n\n"
-
-            for i, item in enumerate(news_items, 1):
-                summary_text += f"{i}. **{item.get('title', 'No title')}**\n"
-                summary_text += f"   {item.get('summary', 'No summary')}\n"
-                if item.get('source'):
-                    summary_text += f"   来源: {item['source']}\n"
-                if item.get('url'):
-                    summary_text += f"   链接: {item['url']}\n"
-                summary_text += "\n"
+            if args.get("format", "text") == "card":
+                parts, msg_type = render_news_card(news_items, date), "interactive"
+            else:
+                parts, msg_type = render_news_text(news_items, date), "text"
+
+            deliveries = {
+                receive_id: [
+                    self.outbox.enqueue({"receive_id": receive_id, "content": part, "msg_type": msg_type})
+                    for part in parts
+                ]
+                for receive_id in recipients
+            }
+
+            wait_seconds = float(args.get("wait_seconds", 5))
+            all_ids = [delivery_id for ids in deliveries.values() for delivery_id in ids]
+            if wait_seconds > 0:
+                statuses = await asyncio.gather(*(self.outbox.wait(delivery_id, wait_seconds) for delivery_id in all_ids))
+            else:
+                statuses = [self.outbox.status(delivery_id) for delivery_id in all_ids]
+            by_id = {status["id"]: status for status in statuses}
+
+            results = []
+            for receive_id, ids in deliveries.items():
+                part_statuses = [by_id[delivery_id]["status"] for delivery_id in ids]
+                if all(status == "delivered" for status in part_statuses):
+                    overall = "delivered"
+                elif "failed" in part_statuses:
+                    overall = "failed"
+                else:
+                    overall = "pending"
+                results.append({
+                    "receive_id": receive_id,
+                    "status": overall,
+                    "deliveries": [
+                        {key: by_id[delivery_id][key] for key in ("id", "status", "attempts", "last_error")}
+                        for delivery_id in ids
+                    ]
+                })
+
+            report = {"parts": len(parts), "format": msg_type, "recipients": results}
+            return self.create_json_result(report, is_error=all(result["status"] == "failed" for result in results))
 
-            result = await self.feishu.send_message(group_id, summary_text)
+        except Exception as e:
+            return self.create_error_result(str(e))
 
-            if result.get("code") == 0:
-                return self.create_success_result("News summary sent successfully")
+    async def _get_delivery_status(self, args: Dict[str, Any]) -> CallToolResult:
+        """Report delivery progress for one message or the whole outbox"""
+        try:
+            delivery_id = args.get("delivery_id")
+            if not delivery_id:
+                status = {"summary": self.outbox.summary()}
+            elif delivery_id not in self.outbox.records:
+                return self.create_error_result(f"Unknown delivery ID: {delivery_id}")
             else:
-                return self.create_error_result(f"Failed to send news summary: {result.get('msg')}")
+                wait_seconds = float(args.get("wait_seconds", 0))
+                if wait_seconds > 0:
+                    status = await self.outbox.wait(delivery_id, timeout=wait_seconds)
+                else:
+                    status = self.outbox.status(delivery_id)
+
+            return self.create_json_result(status)
 
         except Exception as e:
             return self.create_error_result(str(e))
 
-async def main():
+async def main(transport: Optional[str] = None):
     """Main server entry point"""
     server = FeishuMCPServer()
-    await server.run()
+    await server.run(transport)
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Multi-server host: several MCP servers in one process
+"""
+
+import asyncio
+import importlib
+import logging
+from typing import Any, Dict, List, Optional
+
+from mcp.types import CallToolResult, Tool
+
+from core.base_server import BaseMCPServer
+
+logger = logging.getLogger(__name__)
+
+# alias -> (module, class) of the servers the host can load
+HOSTED_SERVERS = {
+    "feishu": ("servers.feishu_server", "FeishuMCPServer"),
+    "news": ("servers.news_server", "NewsMCPServer"),
+    "weather": ("servers.weather_server", "WeatherMCPServer"),
+    "jimeng": ("servers.jimeng_mcp_server", "JimengMCPServer")
+}
+
+TOOL_SEPARATOR = "__"
+
+class MultiServerHost(BaseMCPServer):
+    """Serve several BaseMCPServer subclasses over one connection
+
+    All hosted servers run on one event loop and share the host's pooled
+    HTTP client (HTTP/2 where available). Each hosted tool is exposed as
+    ``<alias>__<tool>``, e.g. ``weather__get_current_weather``, so every
+    server stays addressable under its own name.
+
+    Calls go straight to the hosted server's dispatch, so each call passes
+    through exactly one result cache and one set of per-tool limits and
+    deadlines: those of the server that owns the tool. The global
+    MCP_MAX_CONCURRENT_CALLS limit and the inbound rate limit are the
+    host's, shared by all hosted servers, so they apply once per process.
+    Domain caches and queues stay per server; the host starts and closes
+    them together.
+    """
+
+    # Feishu benefits from HTTP/2; Jimeng passes its own per-request timeout
+    http_client_options = {"http2": True}
+
+    def __init__(self, aliases: List[str]):
+        super().__init__("agent-tt-host")
+        self.servers: Dict[str, BaseMCPServer] = {}
+        for alias in aliases:
+            module_name, class_name = HOSTED_SERVERS[alias]
+            server = getattr(importlib.import_module(module_name), class_name)()
+            server.share_http_client(self)
+            # Hosted servers take tokens and global slots from the host's
+            # bucket and limiter after their own cache lookups
+            server.rate_limiter = self.rate_limiter
+            server.admission.global_limiter = self.admission.global_limiter
+            self.servers[alias] = server
+
+    def get_tools(self) -> List[Tool]:
+        """Return every hosted tool under its namespaced name"""
+        tools = []
+        for alias, server in self.servers.items():
+            for tool in server.get_tools():
+                tools.append(tool.model_copy(update={
+                    "name": f"{alias}{TOOL_SEPARATOR}{tool.name}",
+                    "description": f"[{alias}] {tool.description}"
+                }))
+        return tools
+
+    async def handle_tool_call(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Route a namespaced tool call to its server"""
+        alias, _, tool_name = name.partition(TOOL_SEPARATOR)
+        server = self.servers.get(alias)
+        if server is None or not tool_name:
+            return self.create_error_result(f"Unknown tool: {name}")
+        return await server.dispatch_tool_call(tool_name, arguments)
+
+    async def dispatch_tool_call(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Route without the host's own admission layer
+
+        The hosted server applies its cache, the shared global limit and its
+        per-tool limits; going through the host's admission as well would
+        count every call against the global limit twice.
+        """
+        return await self.handle_tool_call(name, arguments)
+
+    async def startup(self):
+        for server in self.servers.values():
+            await server.startup()
+
+    async def aclose(self):
+        """Close hosted servers, then the shared HTTP client"""
+        results = await asyncio.gather(
+            *(server.aclose() for server in self.servers.values()),
+            return_exceptions=True
+        )
+        for alias, result in zip(self.servers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to close {alias} server: {result}")
+        await super().aclose()
+
+async def main(aliases: List[str] = None, transport: Optional[str] = None):
+    """Main server entry point"""
+    server = MultiServerHost(aliases or list(HOSTED_SERVERS))
+    await server.run(transport)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,33 +6,37 @@ A Model Context Protocol server for Jimeng AI image generation
 
 import os
 import json
+import time
+import uuid
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 from datetime import datetime
 
 import httpx
-from mcp.server import Server
-from mcp.server.models import InitializationOptions
-from mcp.server.stdio import stdio_server
-from mcp.types import (
-    CallToolRequest,
-    CallToolResult,
-    ListToolsRequest,
-    TextContent,
-    Tool,
-    INVALID_PARAMS,
-    INTERNAL_ERROR
-)
-
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+from mcp.types import CallToolResult, TextContent, Tool
+
+from core.base_server import BaseMCPServer
+from utils.cache import SingleFlight
+from utils.concurrency import ToolLimits
+from utils.config import config_manager
+from utils.http_client import create_http_client
+from utils.image_cache import ImageCache, request_key
+from utils.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 class JimengAPI:
-    """Jimeng AI API client"""
+    """Jimeng AI API client
 
-    def __init__(self):
+    Successful generations are stored in a content-addressed image cache
+    keyed by the normalized request, so repeating a request returns the
+    stored image without calling the API. Identical requests that arrive
+    while a generation is running share it.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.base_url = "https://jimeng.jianying.com"
         self.api_key = os.getenv('JIMENG_API_KEY') or os.getenv('jimeng_key')
         self.session_token = os.getenv('JIMENG_SESSION_TOKEN') or self.api_key
@@ -40,49 +44,102 @@ class JimengAPI:
         if not self.session_token:
             raise ValueError("JIMENG_SESSION_TOKEN or JIMENG_API_KEY must be set")
 
+        self.cache = ImageCache(
+            os.getenv('JIMENG_CACHE_DIR', 'cache/jimeng'),
+            max_bytes=int(float(os.getenv('JIMENG_CACHE_MAX_MB', '500')) * 1024 * 1024)
+        )
+        self._flight = SingleFlight()
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = create_http_client(timeout=60.0)
+        return self._client
+
     async def generate_image(self, prompt: str, style: str = "通用", size: str = "1024x1024", model: str = "jimeng-2.1") -> Dict[str, Any]:
-        """Generate image using Jimeng API"""
+        """Generate image using Jimeng API, serving repeated requests from the cache"""
+        key = request_key(prompt=prompt, style=style, size=size, model=model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            # The stored image_url is a signed link that expires within hours,
+            # so hits point at the local copy only
+            return {
+                "success": True,
+                "data": cached["data"],
+                "image_url": None,
+                "image_path": cached["image_path"],
+                "cached": True
+            }
+
+        # Cancelling the last caller (e.g. cancel_image_job) aborts the upstream request
+        result = await self._flight.do(
+            key, lambda: self._generate(key, prompt, style, size, model), cancel_orphaned=True
+        )
+        return dict(result)
+
+    async def _generate(self, key: str, prompt: str, style: str, size: str, model: str) -> Dict[str, Any]:
+        result = await self._call_generate(prompt, style, size, model)
+        if result["success"] and result.get("image_url"):
+            try:
+                stored = await self._store_image(key, result, {"prompt": prompt, "style": style, "size": size, "model": model})
+                if stored is not None:
+                    result["image_path"] = stored["image_path"]
+            except Exception as e:
+                logger.warning(f"Failed to cache generated image: {e}")
+        result["cached"] = False
+        return result
+
+    async def _store_image(self, key: str, result: Dict[str, Any], request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Download the generated image into the cache"""
+        async with self.client.stream("GET", result["image_url"]) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "image/png").split(";")[0]
+            extension = {"image/jpeg": "jpg", "image/webp": "webp", "image/gif": "gif"}.get(content_type, "png")
+            metadata = {"request": request, "data": result["data"], "image_url": result["image_url"]}
+            return await self.cache.put(key, metadata, response.aiter_bytes(), extension)
+
+    async def _call_generate(self, prompt: str, style: str, size: str, model: str) -> Dict[str, Any]:
         try:
-            async with httpx.AsyncClient() as client:
-                # Parse size to width and height
-                if 'x' in size:
-                    width, height = map(int, size.split('x'))
-                else:
-                    width = height = 1024
-
-                headers = {
-                    "Cookie": f"sessionid={self.session_token}",
-                    "Content-Type": "application/json",
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
+            # Parse size to width and height
+            if 'x' in size:
+                width, height = map(int, size.split('x'))
+            else:
+                width = height = 1024
+
+            headers = {
+                "Cookie": f"sessionid={self.session_token}",
+                "Content-Type": "application/json",
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            }
 
-                data = {
-                    "prompt": prompt,
-                    "width": width,
-                    "height": height,
-                    "sample_strength": 0.5
-                }
+            data = {
+                "prompt": prompt,
+                "width": width,
+                "height": height,
+                "sample_strength": 0.5
+            }
 
-                response = await client.post(
-                    f"{self.base_url}/api/v1/generate",
-                    headers=headers,
-                    json=data,
-                    timeout=60.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return {
-                        "success": True,
-                        "data": result,
-                        "image_url": result.get("url") or result.get("image_url")
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"API Error: {response.status_code} - {response.text}",
-                        "status_code": response.status_code
-                    }
+            response = await self.client.post(
+                f"{self.base_url}/api/v1/generate",
+                headers=headers,
+                json=data,
+                timeout=60.0
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                return {
+                    "success": True,
+                    "data": result,
+                    "image_url": result.get("url") or result.get("image_url")
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"API Error: {response.status_code} - {response.text}",
+                    "status_code": response.status_code
+                }
 
         except Exception as e:
             logger.error(f"Jimeng API error: {str(e)}")
@@ -91,6 +148,69 @@ class JimengAPI:
                 "error": f"Request failed: {str(e)}"
             }
 
+    async def generate_batch(
+        self,
+        base_prompt: str,
+        variations: List[Dict[str, Any]],
+        max_concurrency: int = 4,
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Generate several variants of one prompt concurrently
+
+        Each variation may override style, size and model and append a
+        ``prompt_suffix`` to the base prompt. At most ``max_concurrency``
+        generations run at once; ``on_result`` is awaited with each variant
+        as soon as it finishes. Variants are returned in request order.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        batch_started = time.perf_counter()
+
+        async def run(index: int, variation: Dict[str, Any]) -> Dict[str, Any]:
+            suffix = (variation.get("prompt_suffix") or "").strip()
+            params = {
+                "prompt": f"{base_prompt}, {suffix}" if suffix else base_prompt,
+                "style": variation.get("style", "通用"),
+                "size": variation.get("size", "1024x1024"),
+                "model": variation.get("model", "jimeng-2.1")
+            }
+            async with semaphore:
+                started = time.perf_counter()
+                result = await self.generate_image(**params)
+                finished = time.perf_counter()
+
+            variant = {
+                "index": index,
+                "label": variation.get("label") or f"variant-{index + 1}",
+                "params": params,
+                "success": result["success"],
+                "image_url": result.get("image_url"),
+                "image_path": result.get("image_path"),
+                "cached": result.get("cached", False),
+                "error": result.get("error"),
+                "queued_ms": round((started - batch_started) * 1000, 1),
+                "duration_ms": round((finished - started) * 1000, 1)
+            }
+            if on_result is not None:
+                try:
+                    await on_result(variant)
+                except Exception as e:
+                    logger.warning(f"Failed to report batch progress: {e}")
+            return variant
+
+        variants = await asyncio.gather(*(run(i, variation) for i, variation in enumerate(variations)))
+        return {
+            "base_prompt": base_prompt,
+            "succeeded": sum(1 for variant in variants if variant["success"]),
+            "failed": sum(1 for variant in variants if not variant["success"]),
+            "wall_time_ms": round((time.perf_counter() - batch_started) * 1000, 1),
+            "sum_of_durations_ms": round(sum(variant["duration_ms"] for variant in variants), 1),
+            "variants": variants
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return image cache statistics"""
+        return {**self.cache.stats(), "coalesced": self._flight.coalesced}
+
     async def get_models(self) -> Dict[str, Any]:
         """Get available models from Jimeng API (mock implementation)"""
         # Since we don't have access to a models endpoint, return mock data
@@ -108,165 +228,530 @@ class JimengAPI:
             ]
         }
 
-# Initialize Jimeng API
-jimeng_api = JimengAPI()
+class ImageJobQueue:
+    """Persistent priority queue of image generation jobs
+
+    Jobs run on ``concurrency`` workers, highest ``priority`` first and in
+    submission order within a priority. Every job is written to ``job_dir``
+    as one JSON file on each state change; on restart, jobs that were
+    queued or running are queued again. Finished jobs older than
+    ``retention`` seconds are pruned at load and, while running, whenever
+    a job finishes (at most once a minute).
+
+    States: queued -> running -> succeeded | failed, or cancelled
+    """
+
+    TERMINAL = ("succeeded", "failed", "cancelled")
+
+    def __init__(self, api: JimengAPI, job_dir: str, concurrency: int = 2, retention: float = 7 * 86400):
+        self.api = api
+        self.job_dir = Path(job_dir)
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.concurrency = max(1, concurrency)
+        self.retention = retention
+
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._seq = 0
+        self._pruned_at = 0.0
+        self._load()
+
+    def _load(self):
+        for path in self.job_dir.glob("*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable job file {path.name}: {e}")
+                continue
+            if job["status"] == "running":
+                # Interrupted by a restart
+                job["status"] = "queued"
+            self.jobs[job["id"]] = job
+        self._prune()
+
+    def _prune(self):
+        """Drop finished jobs older than the retention window"""
+        now = time.time()
+        self._pruned_at = now
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job["status"] in self.TERMINAL and job["updated_at"] < now - self.retention
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+            (self.job_dir / f"{job_id}.json").unlink(missing_ok=True)
+
+    def _finish(self, job: Dict[str, Any]):
+        job["finished_at"] = time.time()
+        self._persist(job)
+        if time.time() - self._pruned_at > 60:
+            self._prune()
+
+    def _persist(self, job: Dict[str, Any]):
+        job["updated_at"] = time.time()
+        path = self.job_dir / f"{job['id']}.json"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _enqueue(self, job: Dict[str, Any]):
+        self._seq += 1
+        self._queue.put_nowait((-job["priority"], job["created_at"], self._seq, job["id"]))
+
+    def start(self):
+        """Start workers inside the running event loop (idempotent)"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue()
+        for job in self.jobs.values():
+            if job["status"] == "queued":
+                self._enqueue(job)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def submit(self, params: Dict[str, Any], priority: int = 5) -> Dict[str, Any]:
+        """Queue a generation and return the job record"""
+        self.start()
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "params": params,
+            "priority": priority,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        self.jobs[job["id"]] = job
+        self._persist(job)
+        self._enqueue(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is not None and job["status"] == "queued" and self._queue is not None:
+            ahead = sum(
+                1 for other in self.jobs.values()
+                if other["status"] == "queued"
+                and (-other["priority"], other["created_at"]) < (-job["priority"], job["created_at"])
+            )
+            return {**job, "queue_position": ahead + 1}
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        job = self.jobs.get(job_id)
+        if job is None or job["status"] in self.TERMINAL:
+            return job
+        job["status"] = "cancelled"
+        self._finish(job)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return job
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+    async def _worker(self):
+        while True:
+            _, _, _, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] != "queued":
+                continue
+
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            self._persist(job)
+
+            task = asyncio.create_task(self.api.generate_image(**job["params"]))
+            self._running[job_id] = task
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                if job["status"] == "cancelled":
+                    continue
+                # The worker itself is shutting down; the job resumes on restart
+                task.cancel()
+                raise
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            finally:
+                self._running.pop(job_id, None)
+
+            if result["success"]:
+                job["status"] = "succeeded"
+                job["result"] = {key: result.get(key) for key in ("image_url", "image_path", "cached")}
+            else:
+                job["status"] = "failed"
+                job["error"] = result.get("error")
+            self._finish(job)
+
+    async def aclose(self):
+        """Stop workers; unfinished jobs stay on disk and resume on restart"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+class JimengMCPServer(BaseMCPServer):
+    """Jimeng MCP Server
+
+    The API client, image cache and job queue are built on the first tool
+    call that needs them, so the server can start and list its tools
+    without credentials.
+    """
+
+    # Generation requests can take up to a minute
+    http_client_options = {"timeout": 60.0}
+
+    # Synchronous generations hold a socket for up to a minute each; long
+    # or bulk work should go through submit_image_job instead
+    tool_limits = {
+        "generate_image": ToolLimits(max_concurrent=4, max_queue=8, timeout=150),
+        "generate_image_batch": ToolLimits(max_concurrent=1, max_queue=2, timeout=600)
+    }
 
-class JimengMCPServer:
     def __init__(self):
-        self.server = Server("jimeng-mcp")
-        self.setup_handlers()
-
-    def setup_handlers(self):
-        @self.server.list_tools()
-        async def list_tools() -> List[Tool]:
-            """List available Jimeng tools"""
-            return [
-                Tool(
-                    name="generate_image",
-                    description="Generate an image using Jimeng AI",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "prompt": {
-                                "type": "string",
-                                "description": "The text prompt for image generation"
-                            },
-                            "style": {
-                                "type": "string",
-                                "description": "Image style (default: 通用)",
-                                "default": "通用",
-                                "enum": ["通用", "写实", "动漫", "油画", "水彩", "素描", "国风"]
-                            },
-                            "size": {
-                                "type": "string",
-                                "description": "Image size (default: 1024x1024)",
-                                "default": "1024x1024",
-                                "enum": ["512x512", "768x768", "1024x1024", "1024x1536", "1536x1024"]
-                            },
-                            "model": {
-                                "type": "string",
-                                "description": "Model to use for generation (default: jimeng-2.1)",
-                                "default": "jimeng-2.1"
+        super().__init__("jimeng-mcp")
+        self._api: Optional[JimengAPI] = None
+        self._job_queue: Optional[ImageJobQueue] = None
+
+    @property
+    def api(self) -> JimengAPI:
+        if self._api is None:
+            self._api = JimengAPI(client=self.http_client)
+        return self._api
+
+    @property
+    def job_queue(self) -> ImageJobQueue:
+        if self._job_queue is None:
+            self._job_queue = ImageJobQueue(
+                self.api,
+                config_manager.get_env_var("JIMENG_JOB_DIR", "data/jimeng_jobs"),
+                concurrency=int(config_manager.get_env_var("JIMENG_JOB_CONCURRENCY", "2"))
+            )
+        return self._job_queue
+
+    async def startup(self):
+        """Resume jobs left over from the previous run"""
+        job_dir = Path(config_manager.get_env_var("JIMENG_JOB_DIR", "data/jimeng_jobs"))
+        has_credentials = config_manager.get_env_var("JIMENG_SESSION_TOKEN") or config_manager.get_env_var("JIMENG_API_KEY")
+        if has_credentials and any(job_dir.glob("*.json")):
+            self.job_queue.start()
+
+    async def aclose(self):
+        """Stop job workers and close the HTTP client"""
+        if self._job_queue is not None:
+            await self._job_queue.aclose()
+        await super().aclose()
+
+    def get_tools(self) -> List[Tool]:
+        """Return list of Jimeng tools"""
+        return [
+            Tool(
+                name="generate_image",
+                description="Generate an image using Jimeng AI",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "prompt": {
+                            "type": "string",
+                            "description": "The text prompt for image generation"
+                        },
+                        "style": {
+                            "type": "string",
+                            "description": "Image style (default: 通用)",
+                            "default": "通用",
+                            "enum": ["通用", "写实", "动漫", "油画", "水彩", "素描", "国风"]
+                        },
+                        "size": {
+                            "type": "string",
+                            "description": "Image size (default: 1024x1024)",
+                            "default": "1024x1024",
+                            "enum": ["512x512", "768x768", "1024x1024", "1024x1536", "1536x1024"]
+                        },
+                        "model": {
+                            "type": "string",
+                            "description": "Model to use for generation (default: jimeng-2.1)",
+                            "default": "jimeng-2.1"
+                        }
+                    },
+                    "required": ["prompt"]
+                }
+            ),
+            Tool(
+                name="get_models",
+                description="Get list of available Jimeng AI models",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            ),
+            Tool(
+                name="generate_image_batch",
+                description="Generate several variants of one prompt concurrently (e.g. outfit previews in different styles)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "prompt": {"type": "string", "description": "Base prompt shared by all variants"},
+                        "variations": {
+                            "type": "array",
+                            "minItems": 1,
+                            "maxItems": 8,
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "label": {"type": "string"},
+                                    "prompt_suffix": {"type": "string", "description": "Text appended to the base prompt"},
+                                    "style": {
+                                        "type": "string",
+                                        "enum": ["通用", "写实", "动漫", "油画", "水彩", "素描", "国风"]
+                                    },
+                                    "size": {
+                                        "type": "string",
+                                        "enum": ["512x512", "768x768", "1024x1024", "1024x1536", "1536x1024"]
+                                    },
+                                    "model": {"type": "string"}
+                                }
                             }
                         },
-                        "required": ["prompt"]
+                        "max_concurrency": {
+                            "type": "integer",
+                            "description": "Maximum generations running at once (default: JIMENG_BATCH_CONCURRENCY)",
+                            "minimum": 1
+                        }
+                    },
+                    "required": ["prompt", "variations"]
+                }
+            ),
+            Tool(
+                name="submit_image_job",
+                description="Queue an image generation and return a job ID immediately",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "prompt": {"type": "string", "description": "The text prompt for image generation"},
+                        "style": {
+                            "type": "string",
+                            "default": "通用",
+                            "enum": ["通用", "写实", "动漫", "油画", "水彩", "素描", "国风"]
+                        },
+                        "size": {
+                            "type": "string",
+                            "default": "1024x1024",
+                            "enum": ["512x512", "768x768", "1024x1024", "1024x1536", "1536x1024"]
+                        },
+                        "model": {"type": "string", "default": "jimeng-2.1"},
+                        "priority": {
+                            "type": "integer",
+                            "description": "Higher runs first (default: 5)",
+                            "default": 5,
+                            "minimum": 0,
+                            "maximum": 10
+                        }
+                    },
+                    "required": ["prompt"]
+                }
+            ),
+            Tool(
+                name="get_image_job",
+                description="Get the status and result of an image job, or a summary of all jobs",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "job_id": {"type": "string", "description": "Job ID returned by submit_image_job"}
                     }
+                }
+            ),
+            Tool(
+                name="cancel_image_job",
+                description=(
+                    "Cancel a queued or running image job. A running generation is aborted "
+                    "unless another request is waiting for the same image"
                 ),
-                Tool(
-                    name="get_models",
-                    description="Get list of available Jimeng AI models",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                )
-            ]
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "job_id": {"type": "string", "description": "Job ID returned by submit_image_job"}
+                    },
+                    "required": ["job_id"]
+                }
+            ),
+            Tool(
+                name="image_cache_stats",
+                description="Get hit/miss statistics for the generated image cache",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            )
+        ]
+
+    async def handle_tool_call(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Handle tool calls"""
+        if name == "generate_image":
+            return await self._generate_image(arguments)
+        elif name == "get_models":
+            return await self._get_models(arguments)
+        elif name == "generate_image_batch":
+            return await self._generate_image_batch(arguments)
+        elif name == "submit_image_job":
+            return await self._submit_image_job(arguments)
+        elif name == "get_image_job":
+            return await self._get_image_job(arguments)
+        elif name == "cancel_image_job":
+            return await self._cancel_image_job(arguments)
+        elif name == "image_cache_stats":
+            return self.create_json_result(self.api.cache_stats())
+        else:
+            return self.create_error_result(f"Unknown tool: {name}")
+
+    async def _generate_image(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Generate one image"""
+        prompt = arguments.get("prompt")
+        if not prompt:
+            return self.create_error_result("prompt is required")
+
+        style = arguments.get("style", "通用")
+        size = arguments.get("size", "1024x1024")
+        model = arguments.get("model", "jimeng-2.1")
+
+        logger.info(f"Generating image with prompt: {prompt}")
+        result = await self.api.generate_image(prompt, style, size, model)
+
+        if result["success"]:
+            response_text = f"✅ Image generated successfully!\n\n"
+            response_text += f"📝 Prompt: {prompt}\n"
+            response_text += f"🎨 Style: {style}\n"
+            response_text += f"📐 Size: {size}\n"
+            response_text += f"🤖 Model: {model}\n"
+
+            if result.get("image_url"):
+                response_text += f"\n🖼️ Image URL: {result['image_url']}\n"
+            if result.get("image_path"):
+                response_text += f"💾 Local file: {result['image_path']}\n"
+            if result.get("cached"):
+                response_text += "♻️ Served from cache\n"
+
+            # The raw API response is left out; it can be many times the size of the summary
+            summary = {key: value for key, value in result.items() if key != "data"}
+            return CallToolResult(
+                content=[TextContent(type="text", text=response_text)],
+                structuredContent=summary if self.structured_results else None
+            )
+        else:
+            error_text = f"❌ Image generation failed!\n\n"
+            error_text += f"📝 Prompt: {prompt}\n"
+            error_text += f"❌ Error: {result['error']}"
+
+            return CallToolResult(
+                content=[TextContent(type="text", text=error_text)],
+                isError=True
+            )
 
-        @self.server.call_tool()
-        async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
-            """Handle tool calls"""
-            try:
-                if name == "generate_image":
-                    prompt = arguments.get("prompt")
-                    if not prompt:
-                        return CallToolResult(
-                            content=[TextContent(type="text", text="Error: prompt is required")],
-                            isError=True
-                        )
-
-                    style = arguments.get("style", "通用")
-                    size = arguments.get("size", "1024x1024")
-                    model = arguments.get("model", "jimeng-2.1")
-
-                    logger.info(f"Generating image with prompt: {prompt}")
-                    result = await jimeng_api.generate_image(prompt, style, size, model)
-
-                    if result["success"]:
-                        response_text = f"✅ Image generated successfully!\n\n"
-                        response_text += f"📝 Prompt: {prompt}\n"
-                        response_text += f"🎨 Style: {style}\n"
-                        response_text += f"📐 Size: {size}\n"
-                        response_text += f"🤖 Model: {model}\n"
-
-                        if result.get("image_url"):
-                            response_text += f"\n🖼️ Image URL: {result['image_url']}\n"
-
-                        response_text += f"\n📊 Full Response:\n```json\n{json.dumps(result['data'], indent=2, ensure_ascii=False)}\n```"
-
-                        return CallToolResult(
-                            content=[TextContent(type="text", text=response_text)]
-                        )
-                    else:
-                        error_text = f"❌ Image generation failed!\n\n"
-                        error_text += f"📝 Prompt: {prompt}\n"
-                        error_text += f"❌ Error: {result['error']}"
-
-                        return CallToolResult(
-                            content=[TextContent(type="text", text=error_text)],
-                            isError=True
-                        )
-
-                elif name == "get_models":
-                    logger.info("Getting available models")
-                    result = await jimeng_api.get_models()
-
-                    if result["success"]:
-                        response_text = "✅ Available Jimeng AI Models:\n\n"
-                        for model in result["models"]:
-                            response_text += f"🤖 {model.get('id', 'Unknown')}\n"
-                            if model.get('description'):
-                                response_text += f"   📝 {model['description']}\n"
-                            response_text += "\n"
-
-                        return CallToolResult(
-                            content=[TextContent(type="text", text=response_text)]
-                        )
-                    else:
-                        error_text = f"❌ Failed to get models: {result['error']}"
-                        return CallToolResult(
-                            content=[TextContent(type="text", text=error_text)],
-                            isError=True
-                        )
-
-                else:
-                    return CallToolResult(
-                        content=[TextContent(type="text", text=f"Unknown tool: {name}")],
-                        isError=True
-                    )
+    async def _get_models(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """List available models"""
+        logger.info("Getting available models")
+        result = await self.api.get_models()
+
+        if result["success"]:
+            response_text = "✅ Available Jimeng AI Models:\n\n"
+            for model in result["models"]:
+                response_text += f"🤖 {model.get('id', 'Unknown')}\n"
+                if model.get('description'):
+                    response_text += f"   📝 {model['description']}\n"
+                response_text += "\n"
+
+            return CallToolResult(
+                content=[TextContent(type="text", text=response_text)]
+            )
+        else:
+            error_text = f"❌ Failed to get models: {result['error']}"
+            return CallToolResult(
+                content=[TextContent(type="text", text=error_text)],
+                isError=True
+            )
 
-            except Exception as e:
-                logger.error(f"Tool call error: {str(e)}")
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Error: {str(e)}")],
-                    isError=True
-                )
-
-# Create server instance
-mcp_server = JimengMCPServer()
-
-async def main():
-    """Main entry point"""
-    # Load environment variables from config/.env
-    config_env_path = os.path.join(os.path.dirname(__file__), 'config', '.env')
-    if os.path.exists(config_env_path):
-        from dotenv import load_dotenv
-        load_dotenv(config_env_path)
-        logger.info(f"Loaded environment from {config_env_path}")
-
-    logger.info("Starting Jimeng MCP Server...")
-    async with stdio_server() as (read_stream, write_stream):
-        await mcp_server.server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="jimeng-mcp",
-                server_version="1.0.0",
-                capabilities=mcp_server.server.get_capabilities(
-                    notification_options=None,
-                    experimental_capabilities=None
-                )
+    async def _generate_image_batch(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Generate several variants concurrently, reporting each as it finishes"""
+        variations = arguments.get("variations") or []
+        if not arguments.get("prompt") or not variations:
+            return self.create_error_result("prompt and variations are required")
+
+        # Report each finished variant as a progress notification
+        ctx = self.server.request_context
+        progress_token = ctx.meta.progressToken if ctx.meta else None
+        completed = 0
+
+        async def report(variant: Dict[str, Any]):
+            nonlocal completed
+            completed += 1
+            if progress_token is None:
+                return
+            await ctx.session.send_progress_notification(
+                progress_token,
+                completed,
+                total=len(variations),
+                message=dumps(variant, backend=self.json_backend),
+                related_request_id=ctx.request_id
             )
+
+        logger.info(f"Generating {len(variations)} variants of prompt: {arguments['prompt']}")
+        batch = await self.api.generate_batch(
+            arguments["prompt"],
+            variations,
+            max_concurrency=int(
+                arguments.get("max_concurrency") or config_manager.get_env_var("JIMENG_BATCH_CONCURRENCY", "4")
+            ),
+            on_result=report
         )
+        return self.create_json_result(batch, is_error=batch["succeeded"] == 0)
+
+    async def _submit_image_job(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Queue a generation job"""
+        if not arguments.get("prompt"):
+            return self.create_error_result("prompt is required")
+        params = {
+            "prompt": arguments["prompt"],
+            "style": arguments.get("style", "通用"),
+            "size": arguments.get("size", "1024x1024"),
+            "model": arguments.get("model", "jimeng-2.1")
+        }
+        job = self.job_queue.submit(params, int(arguments.get("priority", 5)))
+        logger.info(f"Queued image job {job['id']} with prompt: {params['prompt']}")
+        return self.create_json_result(self.job_queue.get(job["id"]))
+
+    async def _get_image_job(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Report one job, or a summary of all jobs"""
+        job_id = arguments.get("job_id")
+        status = self.job_queue.get(job_id) if job_id else {"summary": self.job_queue.summary()}
+        if status is None:
+            return self.create_error_result(f"Unknown job ID: {job_id}")
+        return self.create_json_result(status)
+
+    async def _cancel_image_job(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Cancel a queued or running job"""
+        job_id = arguments.get("job_id")
+        status = self.job_queue.cancel(job_id)
+        if status is None:
+            return self.create_error_result(f"Unknown job ID: {job_id}")
+        return self.create_json_result(status)
+
+async def main(transport: Optional[str] = None):
+    """Main server entry point"""
+    server = JimengMCPServer()
+    await server.run(transport)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -3,101 +3,399 @@
 Refactored News MCP Server
 """
 
-import json
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+import time
+import asyncio
+import logging
+from itertools import zip_longest
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Any, List, Optional
 
 import httpx
-from mcp.types import CallToolResult, TextContent, Tool
+from mcp.types import CallToolResult, Tool
 
 from core.base_server import BaseMCPServer
+from utils.cache import StaleWhileRevalidateCache
+from utils.circuit_breaker import CircuitBreaker
+from utils.concurrency import ToolLimits
+from utils.config import config_manager
+from utils.disk_cache import DiskCache
+from utils.feed_parser import parse_feed_stream
+from utils.http_client import create_http_client
+from utils.tool_cache import CachePolicy
+
+if TYPE_CHECKING:
+    # Imported on first use: numpy, sqlite3 and the process pool are only
+    # needed once the matching tool is called
+    from utils.article_store import ArticleStore
+    from utils.dedup import DedupIndex
+    from utils.ranking import RelevanceRanker
+    from utils.summarizer import SummaryEngine
+
+logger = logging.getLogger(__name__)
+
+class NoArticlesError(Exception):
+    """Raised when no news source returned any articles"""
 
 class NewsAPI:
     """News API client"""
 
-    def __init__(self, newsapi_key: str = None):
+    # Used when resources/news_sources.json is missing
+    DEFAULT_RSS_SOURCES = [
+        {"name": "AI新闻", "rss": "https://feeds.feedburner.com/oreilly/radar"},
+        {"name": "科技资讯", "rss": "https://feeds.feedburner.com/venturebeat/SZYF"}
+    ]
+    NEWSAPI_SOURCE = "NewsAPI"
+
+    def __init__(
+        self,
+        newsapi_key: str = None,
+        client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 4,
+        source_timeout: float = 10.0,
+        fetch_deadline: float = 15.0,
+        cache: Optional[DiskCache] = None,
+        rss_sources: Optional[List[Dict[str, Any]]] = None,
+        failure_threshold: int = 3,
+        cooldown: float = 600.0
+    ):
         self.newsapi_key = newsapi_key
         self.base_url = "https://newsapi.org/v2"
+        # Lower priority value = more important; fetched and listed first
+        self.rss_sources = sorted(
+            (source for source in (rss_sources or self.DEFAULT_RSS_SOURCES) if source.get("enabled", True)),
+            key=lambda source: source.get("priority", 1)
+        )
+        self.max_concurrency = max(1, max_concurrency)
+        self.source_timeout = source_timeout
+        self.fetch_deadline = fetch_deadline
+        self._client = client
+        self.cache = cache
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Circuit breaker for a named source"""
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return self.breakers[name]
+
+    def source_health(self) -> Dict[str, Any]:
+        """Health and latency statistics for every configured source"""
+        health = {}
+        if self.newsapi_key:
+            health[self.NEWSAPI_SOURCE] = {
+                "url": f"{self.base_url}/everything",
+                "priority": 0,
+                "timeout": self.source_timeout,
+                **self.breaker(self.NEWSAPI_SOURCE).stats()
+            }
+        for source in self.rss_sources:
+            health[source["name"]] = {
+                "url": source["rss"],
+                "priority": source.get("priority", 1),
+                "timeout": source.get("timeout", self.source_timeout),
+                **self.breaker(source["name"]).stats()
+            }
+        return health
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client, shared with the owning server when one is given"""
+        if self._client is None:
+            self._client = create_http_client(timeout=self.source_timeout)
+        return self._client
 
     async def fetch_ai_news(self, limit: int = 10, language: str = "zh") -> List[Dict[str, Any]]:
         """Fetch AI-related news"""
-        if not self.newsapi_key:
+        breaker = self.breaker(self.NEWSAPI_SOURCE)
+        if not self.newsapi_key or not breaker.allow():
             return await self._fetch_rss_news(limit)
 
         keywords = "AI OR 人工智能 OR GPT OR Claude"
 
-        async with httpx.AsyncClient() as client:
-            params = {
-                "q": keywords,
-                "language": language,
-                "sortBy": "publishedAt",
-                "pageSize": limit,
-                "apiKey": self.newsapi_key
-            }
+        params = {
+            "q": keywords,
+            "language": language,
+            "sortBy": "publishedAt",
+            "pageSize": limit,
+            "apiKey": self.newsapi_key
+        }
 
-            try:
-                response = await client.get(f"{self.base_url}/everything", params=params)
-                data = response.json()
-
-                if data.get("status") == "ok":
-                    return [
-                        {
-                            "title": article["title"],
-                            "description": article["description"] or "",
-                            "url": article["url"],
-                            "source": article["source"]["name"],
-                            "published_at": article["publishedAt"]
-                        }
-                        for article in data.get("articles", [])
-                    ]
-                else:
-                    return await self._fetch_rss_news(limit)
-            except Exception:
+        started = time.monotonic()
+        try:
+            articles = await self._conditional_get(
+                f"{self.base_url}/everything", self._parse_newsapi_response, params=params
+            )
+            if articles is not None:
+                breaker.record_success(time.monotonic() - started)
+                return articles
+            else:
+                breaker.record_failure("NewsAPI returned an error status")
                 return await self._fetch_rss_news(limit)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure(e)
+            return await self._fetch_rss_news(limit)
 
-    async def _fetch_rss_news(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Fallback: Fetch news from RSS feeds"""
-        # Simplified RSS sources
-        rss_sources = [
-            {"name": "AI新闻", "rss": "https://feeds.feedburner.com/oreilly/radar"},
-            {"name": "科技资讯", "rss": "https://feeds.feedburner.com/venturebeat/SZYF"}
+    @staticmethod
+    async def _parse_newsapi_response(response: httpx.Response) -> Optional[List[Dict[str, Any]]]:
+        """Parse a NewsAPI page, None when the API reports an error"""
+        await response.aread()
+        data = response.json()
+        if data.get("status") != "ok":
+            return None
+
+        return [
+            {
+                "title": article["title"],
+                "description": article["description"] or "",
+                "url": article["url"],
+                "source": article["source"]["name"],
+                "published_at": article["publishedAt"]
+            }
+            for article in data.get("articles", [])
         ]
 
-        articles = []
-        async with httpx.AsyncClient() as client:
-            for source in rss_sources[:2]:
-                try:
-                    response = await client.get(source["rss"], timeout=10)
-                    root = ET.fromstring(response.text)
-
-                    for item in root.findall(".//item")[:limit//2]:
-                        title = item.find("title")
-                        description = item.find("description")
-                        link = item.find("link")
-
-                        if title is not None and link is not None:
-                            articles.append({
-                                "title": title.text or "",
-                                "description": description.text[:200] + "..." if description is not None else "",
-                                "url": link.text or "",
-                                "source": source["name"],
-                                "published_at": ""
-                            })
-                except Exception:
-                    continue
+    async def _conditional_get(
+        self,
+        url: str,
+        parse: Callable[[httpx.Response], Awaitable[Optional[List[Dict[str, Any]]]]],
+        params: Optional[Dict[str, Any]] = None,
+        needed: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """GET url through the feed cache
+
+        Stored ETag / Last-Modified validators are sent with the request and
+        the previously parsed items are returned as-is on 304 Not Modified.
+        Fresh responses are streamed into ``parse`` and stored when they carry
+        a validator. ``needed`` is the number of items the caller wants; a
+        cached entry holding fewer items from a truncated parse is refetched.
+        """
+        # The API key is not part of the resource identity
+        key_params = sorted((k, str(v)) for k, v in (params or {}).items() if k != "apiKey")
+        cache_key = f"{url}?{key_params}"
+        entry = self.cache.get(cache_key) if self.cache else None
+        if entry and not entry.get("complete", True) and needed is not None and len(entry["items"]) < needed:
+            entry = None
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        async with self.client.stream(
+            "GET", url, params=params, headers=headers, timeout=self.source_timeout
+        ) as response:
+            if response.status_code == 304 and entry is not None:
+                # Revalidated: restart the entry's TTL
+                self.cache.set(cache_key, entry)
+                return entry["items"]
+
+            items = await parse(response)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self.cache and items is not None and (etag or last_modified):
+            self.cache.set(cache_key, {
+                "etag": etag,
+                "last_modified": last_modified,
+                "items": items,
+                "complete": needed is None or len(items) < needed
+            })
+
+        return items
+
+    async def _fetch_rss_news(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Fallback: Fetch news from RSS feeds concurrently
+
+        Feeds are fetched in parallel (at most ``max_concurrency`` at a time),
+        each bounded by its own timeout. Whatever has finished when the global
+        ``fetch_deadline`` expires is returned; slower feeds are cancelled.
+        Sources whose circuit breaker is open are skipped. Only a feed's own
+        timeout or error counts against its breaker; being cut off by the
+        deadline or by cancellation of the whole call does not.
+
+        Each feed is asked for up to ``limit`` items (the streaming parser
+        stops reading once it has them), and the results are interleaved
+        across feeds before truncating, so failed feeds leave their share
+        to the others without one feed crowding out the rest.
+        """
+        limit = int(limit)
+        if limit <= 0:
+            return []
+        sources = [source for source in self.rss_sources if self.breaker(source["name"]).allow()]
+        if not sources:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(source: Dict[str, Any]) -> List[Dict[str, Any]]:
+            breaker = self.breaker(source["name"])
+            timeout = source.get("timeout", self.source_timeout)
+            try:
+                async with semaphore:
+                    started = time.monotonic()
+                    articles = await asyncio.wait_for(self._fetch_rss_source(source, limit), timeout)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure(e)
+                raise
+            breaker.record_success(time.monotonic() - started)
+            return articles
+
+        tasks = [asyncio.create_task(fetch(source)) for source in sources]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.fetch_deadline)
+        except asyncio.CancelledError:
+            # asyncio.wait leaves its tasks running when the caller is cancelled
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"RSS deadline reached, dropped {len(pending)} slow source(s)")
+
+        # Keep source order stable regardless of completion order
+        results = []
+        for source, task in zip(sources, tasks):
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                logger.warning(f"RSS source {source['name']} failed: {task.exception()!r}")
+                continue
+            results.append(task.result())
+
+        # Round-robin: every feed's first item, then every feed's second, ...
+        articles = [article for group in zip_longest(*results) for article in group if article is not None]
+        return articles[:limit]
+
+    async def _fetch_rss_source(self, source: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """Fetch and parse a single RSS feed"""
+        async def parse(response: httpx.Response) -> List[Dict[str, Any]]:
+            response.raise_for_status()
+            return await parse_feed_stream(response.aiter_bytes(), source["name"], limit)
 
+        articles = await self._conditional_get(source["rss"], parse, needed=limit)
         return articles[:limit]
 
 class NewsMCPServer(BaseMCPServer):
     """Refactored News MCP Server"""
 
+    # fetch_ai_news has its own stale-while-revalidate cache and
+    # dedupe_articles records what it has seen, so neither is memoized here.
+    # search_news reads the article store, which every fetch updates; a
+    # memoized result would hide new articles, and FTS lookups are cheap.
+    tool_cache_policies = {
+        "summarize_articles": CachePolicy(
+            ttl=86400, max_entries=512, key_args=["articles", "max_length"], persist=True
+        ),
+        "rank_by_relevance": CachePolicy(ttl=300, max_entries=128)
+    }
+
+    tool_limits = {
+        "fetch_ai_news": ToolLimits(timeout=45),
+        "summarize_articles": ToolLimits(max_concurrent=2, max_queue=8, timeout=120),
+        "search_news": ToolLimits(max_concurrent=4, max_queue=16, timeout=30)
+    }
+
     def __init__(self):
         super().__init__("news-mcp-server")
 
-        # Initialize News API
-        from utils.config import config_manager
-        newsapi_key = config_manager.get_env_var("NEWSAPI_KEY")
-        self.news_api = NewsAPI(newsapi_key)
+        self.results_cache = StaleWhileRevalidateCache(
+            fresh_ttl=float(config_manager.get_env_var("NEWS_RESULT_FRESH_TTL", "300")),
+            stale_ttl=float(config_manager.get_env_var("NEWS_RESULT_STALE_TTL", "3600"))
+        )
+        # Built on first use so startup does not touch disk or import
+        # the heavier dependencies
+        self._news_api: Optional[NewsAPI] = None
+        self._dedup_index: Optional["DedupIndex"] = None
+        self._article_store: Optional["ArticleStore"] = None
+        self._summarizer: Optional["SummaryEngine"] = None
+        self._ranker: Optional["RelevanceRanker"] = None
+
+    @property
+    def news_api(self) -> NewsAPI:
+        if self._news_api is None:
+            sources_config = config_manager.load_json_config("news_sources.json", config_dir="resources")
+            breaker_config = sources_config.get("circuit_breaker", {})
+            self._news_api = NewsAPI(
+                config_manager.get_env_var("NEWSAPI_KEY"),
+                client=self.http_client,
+                max_concurrency=int(config_manager.get_env_var("NEWS_RSS_CONCURRENCY", "4")),
+                source_timeout=float(config_manager.get_env_var("NEWS_RSS_TIMEOUT", "10")),
+                fetch_deadline=float(config_manager.get_env_var("NEWS_FETCH_DEADLINE", "15")),
+                cache=DiskCache(
+                    config_manager.get_env_var("NEWS_CACHE_DIR", "cache/news"),
+                    ttl=float(config_manager.get_env_var("NEWS_CACHE_TTL", "86400")),
+                    max_entries=int(config_manager.get_env_var("NEWS_CACHE_MAX_ENTRIES", "256")),
+                    max_bytes=int(config_manager.get_env_var("NEWS_CACHE_MAX_MB", "20")) * 1024 * 1024
+                ),
+                rss_sources=sources_config.get("rss_sources"),
+                failure_threshold=breaker_config.get("failure_threshold", 3),
+                cooldown=breaker_config.get("cooldown_seconds", 600)
+            )
+        return self._news_api
+
+    @property
+    def dedup_index(self) -> "DedupIndex":
+        if self._dedup_index is None:
+            from utils.dedup import DedupIndex
+            self._dedup_index = DedupIndex(
+                config_manager.get_env_var("NEWS_DEDUP_INDEX", "cache/news_dedup.json"),
+                retention_days=int(config_manager.get_env_var("NEWS_DEDUP_DAYS", "7")),
+                max_distance=int(config_manager.get_env_var("NEWS_DEDUP_DISTANCE", "3"))
+            )
+        return self._dedup_index
+
+    @property
+    def article_store(self) -> "ArticleStore":
+        if self._article_store is None:
+            from utils.article_store import ArticleStore
+            self._article_store = ArticleStore(
+                config_manager.get_env_var("NEWS_STORE_PATH", "data/news_articles.db")
+            )
+        return self._article_store
+
+    @property
+    def summarizer(self) -> "SummaryEngine":
+        if self._summarizer is None:
+            from utils.summarizer import SummaryEngine
+            self._summarizer = SummaryEngine(
+                process_threshold=int(config_manager.get_env_var("NEWS_SUMMARY_PROCESS_THRESHOLD", "32"))
+            )
+        return self._summarizer
+
+    @property
+    def ranker(self) -> "RelevanceRanker":
+        """Relevance ranker with profile vectors precomputed on first use"""
+        if self._ranker is None:
+            from utils.ranking import RelevanceRanker
+            self._ranker = RelevanceRanker.from_profile(
+                config_manager.get_env_var("NEWS_PROFILE_PATH", "aboutme/profile.md"),
+                source_weights={
+                    source["name"]: source["weight"]
+                    for source in self.news_api.rss_sources if "weight" in source
+                },
+                half_life_hours=float(config_manager.get_env_var("NEWS_RECENCY_HALF_LIFE_HOURS", "24"))
+            )
+        return self._ranker
+
+    async def aclose(self):
+        """Close the article store, summarizer pool and the HTTP client"""
+        if self._article_store is not None:
+            self._article_store.close()
+        if self._summarizer is not None:
+            self._summarizer.shutdown()
+        await super().aclose()
 
     def get_tools(self) -> List[Tool]:
         """Return list of news tools"""
@@ -109,11 +407,109 @@ class NewsMCPServer(BaseMCPServer):
                     "type": "object",
                     "properties": {
                         "limit": {"type": "number", "description": "Number of articles", "default": 10},
-                        "language": {"type": "string", "description": "Language preference", "default": "zh"}
+                        "language": {"type": "string", "description": "Language preference", "default": "zh"},
+                        "dedupe": {
+                            "type": "boolean",
+                            "description": "Drop near-duplicate stories across sources and recent days",
+                            "default": False
+                        },
+                        "rank": {
+                            "type": "boolean",
+                            "description": "Over-fetch and keep the most relevant articles",
+                            "default": False
+                        },
+                        "page_size": {
+                            "type": "number",
+                            "description": "Return {items, total, next_cursor} pages of this size instead of one list"
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor from the previous page; other arguments are ignored"
+                        }
+                    },
+                    "required": []
+                }
+            ),
+            Tool(
+                name="dedupe_articles",
+                description="Remove near-duplicate articles across sources and recent days",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "articles": {
+                            "type": "array",
+                            "description": "Articles to deduplicate",
+                            "items": {"type": "object"}
+                        },
+                        "record": {
+                            "type": "boolean",
+                            "description": "Remember unique articles for future checks",
+                            "default": True
+                        }
+                    },
+                    "required": ["articles"]
+                }
+            ),
+            Tool(
+                name="rank_by_relevance",
+                description="Rank news articles by relevance to personal interests, source weight and recency",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "news_list": {
+                            "type": "array",
+                            "description": "Articles to rank",
+                            "items": {"type": "object"}
+                        },
+                        "top_k": {"type": "number", "description": "Number of top articles to return"},
+                        "source_weights": {
+                            "type": "object",
+                            "description": "Optional per-source score multipliers",
+                            "additionalProperties": {"type": "number"}
+                        }
+                    },
+                    "required": ["news_list"]
+                }
+            ),
+            Tool(
+                name="search_news",
+                description="Search previously fetched news by keyword, date range and source",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "Keywords (Chinese or English), all must match"},
+                        "since": {"type": "string", "description": "Start date YYYY-MM-DD (inclusive)"},
+                        "until": {"type": "string", "description": "End date YYYY-MM-DD (inclusive)"},
+                        "source": {"type": "string", "description": "Only articles from this source"},
+                        "limit": {"type": "number", "description": "Page size", "default": 20},
+                        "offset": {"type": "number", "description": "Page offset", "default": 0},
+                        "group_by": {
+                            "type": "string",
+                            "description": "Also count matches per day or per source",
+                            "enum": ["day", "source"]
+                        }
                     },
                     "required": []
                 }
             ),
+            Tool(
+                name="news_source_health",
+                description="Show per-source circuit breaker state, failure counts and latency",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            ),
+            Tool(
+                name="news_cache_stats",
+                description="Show hit/miss counters of the news result and feed caches",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            ),
             Tool(
                 name="summarize_articles",
                 description="Summarize news articles",
@@ -136,6 +532,16 @@ class NewsMCPServer(BaseMCPServer):
         """Handle tool calls"""
         if name == "fetch_ai_news":
             return await self._fetch_ai_news(arguments)
+        elif name == "dedupe_articles":
+            return await self._dedupe_articles(arguments)
+        elif name == "rank_by_relevance":
+            return await self._rank_by_relevance(arguments)
+        elif name == "search_news":
+            return await self._search_news(arguments)
+        elif name == "news_source_health":
+            return await self._news_source_health(arguments)
+        elif name == "news_cache_stats":
+            return await self._news_cache_stats(arguments)
         elif name == "summarize_articles":
             return await self._summarize_articles(arguments)
         else:
@@ -147,11 +553,114 @@ class NewsMCPServer(BaseMCPServer):
             limit = args.get("limit", 10)
             language = args.get("language", "zh")
 
+            dedupe = args.get("dedupe", False)
+            rank = args.get("rank", False)
+
+            async def load() -> List[Dict[str, Any]]:
+                # Over-fetch so dropped duplicates and low-ranked articles can be replaced
+                fetch_limit = limit * 3 if rank else limit * 2 if dedupe else limit
+                articles = await self._fetch_cached(fetch_limit, language)
+
+                if dedupe:
+                    articles, _ = self.dedup_index.dedupe(articles, record=False)
+                if rank:
+                    articles = self.ranker.rank(articles)
+                articles = articles[:int(limit)]
+                if dedupe:
+                    self.dedup_index.dedupe(articles, record=True)
+                return articles
+
+            # Later pages come from a snapshot of the first call, so dedupe
+            # recording does not hide them
+            result = await self.paginator.paginate(load, args.get("cursor"), args.get("page_size"))
+            return self.create_json_result(result)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _fetch_cached(self, limit: int, language: str) -> List[Dict[str, Any]]:
+        """Fetch through the stale-while-revalidate result cache
+
+        Concurrent callers asking for the same (limit, language) share one
+        upstream request; stale results are served while a refresh runs.
+        An empty fetch, which is what every source failing looks like, is
+        not cached, so the previous articles keep being served.
+        """
+        async def load() -> List[Dict[str, Any]]:
             articles = await self.news_api.fetch_ai_news(limit, language)
+            if not articles:
+                raise NoArticlesError("No news source returned articles")
+            await asyncio.to_thread(self.article_store.upsert_articles, articles)
+            return articles
+
+        try:
+            return await self.results_cache.get((int(limit), language), load)
+        except NoArticlesError:
+            return []
+
+    async def _dedupe_articles(self, args: Dict[str, Any]) -> CallToolResult:
+        """Deduplicate articles implementation"""
+        try:
+            articles = args["articles"]
+            record = args.get("record", True)
 
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(articles, ensure_ascii=False, indent=2))]
+            unique, duplicates = self.dedup_index.dedupe(articles, record=record)
+
+            result = {"articles": unique, "duplicates": duplicates}
+            return self.create_json_result(result)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _rank_by_relevance(self, args: Dict[str, Any]) -> CallToolResult:
+        """Rank articles implementation"""
+        try:
+            news_list = args["news_list"]
+            top_k = args.get("top_k")
+            source_weights = args.get("source_weights")
+
+            ranked = self.ranker.rank(
+                news_list, int(top_k) if top_k else None, source_weights=source_weights
             )
+
+            return self.create_json_result(ranked)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _search_news(self, args: Dict[str, Any]) -> CallToolResult:
+        """Search stored articles implementation"""
+        try:
+            result = await asyncio.to_thread(
+                self.article_store.search,
+                query=args.get("query"),
+                since=args.get("since"),
+                until=args.get("until"),
+                source=args.get("source"),
+                limit=int(args.get("limit", 20)),
+                offset=int(args.get("offset", 0)),
+                group_by=args.get("group_by")
+            )
+
+            return self.create_json_result(result)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _news_source_health(self, args: Dict[str, Any]) -> CallToolResult:
+        """News source health implementation"""
+        try:
+            health = self.news_api.source_health()
+
+            return self.create_json_result(health)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _news_cache_stats(self, args: Dict[str, Any]) -> CallToolResult:
+        """News cache statistics implementation"""
+        try:
+            stats = {
+                "results": self.results_cache.stats(),
+                "feeds": self.news_api.cache.stats() if self.news_api.cache else None
+            }
+
+            return self.create_json_result(stats)
         except Exception as e:
             return self.create_error_result(str(e))
 
@@ -159,29 +668,26 @@ class NewsMCPServer(BaseMCPServer):
         """Summarize articles implementation"""
         try:
             articles = args["articles"]
-            max_length = args.get("max_length", 200)
+            max_length = int(args.get("max_length", 200))
 
-            summarized = []
-            for article in articles:
-                description = article.get("description", "")
-                sentences = description.split("。")
-                summary = sentences[0][:max_length] + "..." if len(sentences[0]) > max_length else sentences[0]
+            summaries = await self.summarizer.summarize_articles(articles, max_length)
 
-                summarized.append({
+            summarized = [
+                {
                     **article,
                     "summary": summary if summary else article.get("title", "")[:max_length]
-                })
+                }
+                for article, summary in zip(articles, summaries)
+            ]
 
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(summarized, ensure_ascii=False, indent=2))]
-            )
+            return self.create_json_result(summarized)
         except Exception as e:
             return self.create_error_result(str(e))
 
-async def main():
+async def main(transport: Optional[str] = None):
     """Main server entry point"""
     server = NewsMCPServer()
-    await server.run()
+    await server.run(transport)
 
 if __name__ == "__main__":
     import asyncio
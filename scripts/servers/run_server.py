@@ -1,45 +1,160 @@
 #!/usr/bin/env python3
 """
 Simplified server launcher
+
+    python run_server.py <server_name> [--http]
+    python run_server.py all | news,weather [--http]
+    python run_server.py --measure-startup [server_name ...] [--runs N]
+
+``all`` (or a comma-separated list) runs the servers in one process via
+the multi-server host, with tools named ``<server>__<tool>``. ``--http``
+serves streamable HTTP on MCP_SERVER_HOST:MCP_SERVER_PORT instead of
+stdio, so many clients can share one process.
+
+The measurement mode starts each server in a fresh interpreter and reports
+the time to import its module and, over a real stdio session, the time
+from spawning the process to the initialize handshake and to the first
+list_tools response. Timings are medians over ``--runs`` runs.
 """
 
+import os
 import sys
+import time
 import asyncio
+import importlib
+import statistics
+import subprocess
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+SERVERS = {
+    "feishu": "servers.feishu_server",
+    "news": "servers.news_server",
+    "weather": "servers.weather_server",
+    "jimeng": "servers.jimeng_mcp_server"
+}
+
+HOST_MODULE = "servers.host_server"
+
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "sys.path.insert(0, {path!r})\n"
+    "started = time.perf_counter()\n"
+    "import {modules}\n"
+    "print((time.perf_counter() - started) * 1000)\n"
+)
+
+def parse_server_names(value: str):
+    """Return the server names for one argument: a name, a comma list or 'all'"""
+    if value == "all":
+        return list(SERVERS)
+    names = [name.strip() for name in value.lower().split(",") if name.strip()]
+    unknown = [name for name in names if name not in SERVERS]
+    if unknown:
+        raise ValueError(f"Unknown server: {', '.join(unknown)}")
+    return names
+
+def server_modules(value: str):
+    names = parse_server_names(value)
+    modules = [SERVERS[name] for name in names]
+    return modules if len(names) == 1 and value != "all" else [HOST_MODULE] + modules
+
+def measure_import(value: str) -> float:
+    """Import a server's modules in a fresh interpreter and return the time taken in ms"""
+    probe = IMPORT_PROBE.format(path=str(Path(__file__).parent), modules=", ".join(server_modules(value)))
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+async def measure_handshake(server_name: str):
+    """Spawn a server over stdio; return (ms to initialize, ms to first list_tools, tool count)"""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(Path(__file__).resolve()), server_name],
+        env=dict(os.environ),
+        cwd=os.getcwd()
+    )
+    with open(os.devnull, "w") as devnull:
+        started = time.perf_counter()
+        async with stdio_client(params, errlog=devnull) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                initialized = time.perf_counter()
+                tools = await session.list_tools()
+                listed = time.perf_counter()
+    return (initialized - started) * 1000, (listed - started) * 1000, len(tools.tools)
+
+def measure_startup(server_names, runs: int = 3):
+    """Print startup timings for each server"""
+    print(f"{'server':<10}{'import ms':>12}{'initialize ms':>16}{'list_tools ms':>16}{'tools':>8}")
+    for server_name in server_names:
+        try:
+            imports, inits, lists = [], [], []
+            for _ in range(runs):
+                imports.append(measure_import(server_name))
+                init_ms, list_ms, tool_count = asyncio.run(measure_handshake(server_name))
+                inits.append(init_ms)
+                lists.append(list_ms)
+            print(
+                f"{server_name:<10}{statistics.median(imports):>12.1f}"
+                f"{statistics.median(inits):>16.1f}{statistics.median(lists):>16.1f}{tool_count:>8}"
+            )
+        except Exception as e:
+            print(f"{server_name:<10} failed: {e}")
+
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
-        print("Usage: python run_server.py <server_name>")
-        print("Available servers: feishu, news, weather, jimeng")
+        print("Usage: python run_server.py <server_name> [--http]")
+        print("       python run_server.py all | <server>,<server> [--http]")
+        print("       python run_server.py --measure-startup [server_name ...] [--runs N]")
+        print(f"Available servers: {', '.join(SERVERS)}, all")
         sys.exit(1)
 
+    if sys.argv[1] == "--measure-startup":
+        args = sys.argv[2:]
+        runs = 3
+        if "--runs" in args:
+            idx = args.index("--runs")
+            runs = int(args[idx + 1])
+            del args[idx:idx + 2]
+        try:
+            for name in args:
+                parse_server_names(name)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        measure_startup(args or list(SERVERS), runs)
+        return
+
     server_name = sys.argv[1].lower()
+    transport = "http" if "--http" in sys.argv[2:] else None
+    try:
+        names = parse_server_names(server_name)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
 
     try:
-        if server_name == "feishu":
-            from servers.feishu_server import main as server_main
-        elif server_name == "news":
-            from servers.news_server import main as server_main
-        elif server_name == "weather":
-            from servers.weather_server import main as server_main
-        elif server_name == "jimeng":
-            from servers.jimeng_mcp_server import main as server_main
+        # stdout carries the MCP protocol, so status goes to stderr
+        print(f"Starting {server_name} MCP server...", file=sys.stderr)
+        if len(names) == 1 and server_name != "all":
+            asyncio.run(importlib.import_module(SERVERS[names[0]]).main(transport))
         else:
-            print(f"Unknown server: {server_name}")
-            sys.exit(1)
-
-        print(f"Starting {server_name} MCP server...")
-        asyncio.run(server_main())
+            asyncio.run(importlib.import_module(HOST_MODULE).main(names, transport))
 
     except KeyboardInterrupt:
-        print(f"\n{server_name} server stopped by user")
+        print(f"\n{server_name} server stopped by user", file=sys.stderr)
     except Exception as e:
-        print(f"Error starting {server_name} server: {e}")
+        print(f"Error starting {server_name} server: {e}", file=sys.stderr)
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
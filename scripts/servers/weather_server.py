@@ -3,45 +3,310 @@
 Refactored Weather MCP Server
 """
 
-import json
-from typing import Dict, Any, List
+import re
+import math
+import time
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 
 import httpx
-from mcp.types import CallToolResult, TextContent, Tool
+from mcp.types import CallToolResult, Tool
 
 from core.base_server import BaseMCPServer
+from utils.cache import SingleFlight, TTLCache
+from utils.concurrency import ToolLimits
+from utils.config import config_manager
+from utils.http_client import create_http_client
+
+logger = logging.getLogger(__name__)
+
+# Common Chinese city names mapped to the names OpenWeather resolves
+LOCATION_ALIASES = {
+    "上海": "shanghai",
+    "北京": "beijing",
+    "深圳": "shenzhen",
+    "广州": "guangzhou",
+    "杭州": "hangzhou"
+}
+
+def normalize_location(location: str) -> str:
+    """Normalize a location so equivalent spellings share a cache entry"""
+    location = re.sub(r"\s+", " ", (location or "").strip().lower())
+    location = re.sub(r"\s*,\s*", ",", location)
+    return LOCATION_ALIASES.get(location, location)
+
+def location_params(location: str) -> Dict[str, str]:
+    """OpenWeather query parameters: lat/lon for "lat,lon", otherwise a city name"""
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)", location)
+    if match:
+        return {"lat": match.group(1), "lon": match.group(2)}
+    return {"q": location}
+
+class ForecastSeries:
+    """Compact per-location forecast time series
+
+    Rows are stored column-wise in typed arrays (one float per value instead
+    of one dict per row) with descriptions interned in a small string table.
+    Slices are answered locally with a binary search on the timestamps
+    until ``expires_at``, when the next upstream refresh is due.
+    """
+
+    COLUMNS = ("temperature", "feels_like", "humidity", "wind_speed", "pop")
+
+    def __init__(self, city: str, lat: Optional[float], lon: Optional[float], ttl: float):
+        self.city = city
+        self.lat = lat
+        self.lon = lon
+        self.fetched_at = time.time()
+        self.expires_at = self.fetched_at + ttl
+        self.timestamps = array("d")
+        self.columns = {name: array("d") for name in self.COLUMNS}
+        self.description_ids = array("H")
+        self.descriptions: List[str] = []
+
+    @classmethod
+    def from_openweather(cls, data: Dict[str, Any], ttl: float) -> "ForecastSeries":
+        """Build a series from an OpenWeather /forecast response"""
+        city = data.get("city", {})
+        coord = city.get("coord", {})
+        series = cls(city.get("name", ""), coord.get("lat"), coord.get("lon"), ttl)
+        lookup: Dict[str, int] = {}
+
+        for row in sorted(data.get("list", []), key=lambda row: row["dt"]):
+            main = row.get("main", {})
+            weather = (row.get("weather") or [{}])[0]
+            description = weather.get("description", "")
+            if description not in lookup:
+                lookup[description] = len(series.descriptions)
+                series.descriptions.append(description)
+
+            series.timestamps.append(float(row["dt"]))
+            series.columns["temperature"].append(float(main.get("temp", "nan")))
+            series.columns["feels_like"].append(float(main.get("feels_like", "nan")))
+            series.columns["humidity"].append(float(main.get("humidity", "nan")))
+            series.columns["wind_speed"].append(float(row.get("wind", {}).get("speed", "nan")))
+            series.columns["pop"].append(float(row.get("pop", 0.0)))
+            series.description_ids.append(lookup[description])
+        return series
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def slice(self, hours: float, start: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Rows from the step covering ``start`` (default now) up to ``hours`` ahead"""
+        start = time.time() if start is None else start
+        end = start + hours * 3600
+        # Include the step already in progress
+        first = max(bisect_left(self.timestamps, start) - 1, 0)
+        last = bisect_left(self.timestamps, end)
+
+        rows = []
+        for idx in range(first, last):
+            row = {"time": datetime.fromtimestamp(self.timestamps[idx]).isoformat(timespec="minutes")}
+            for name in self.COLUMNS:
+                value = self.columns[name][idx]
+                # Values missing upstream are stored as NaN, which is not valid JSON
+                row[name] = None if math.isnan(value) else value
+            row["description"] = self.descriptions[self.description_ids[idx]]
+            rows.append(row)
+        return rows
 
 class WeatherAPI:
-    """Weather API client"""
+    """Weather API client
+
+    Responses are cached per normalized location for ``cache_ttl`` seconds
+    and concurrent requests for the same location share one upstream call.
+    Every result carries ``_meta.origin``: "live", "cache", "stale_cache"
+    (upstream failed, older cached data returned) or "mock".
+    """
 
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache_ttl: float = 600,
+        stale_max_age: float = 10800,
+        forecast_ttl: float = 10800
+    ):
         self.api_key = api_key
         self.base_url = "https://api.openweathermap.org/data/2.5" if api_key else None
+        self.onecall_url = "https://api.openweathermap.org/data/3.0/onecall"
+        self._client = client
+        self.cache = TTLCache(ttl=cache_ttl)
+        self.alerts_cache = TTLCache(ttl=cache_ttl)
+        self.stale_max_age = stale_max_age
+        self.forecast_ttl = forecast_ttl
+        self.forecasts: Dict[str, ForecastSeries] = {}
+        self._flight = SingleFlight()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client, shared with the owning server when one is given"""
+        if self._client is None:
+            self._client = create_http_client()
+        return self._client
 
     async def get_current_weather(self, location: str = "Shanghai") -> Dict[str, Any]:
         """Get current weather information"""
+        key = normalize_location(location)
         if not self.api_key:
-            return self._get_mock_weather()
+            return self._get_mock_weather(key, "OPENWEATHER_API_KEY not configured")
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            data, age = cached
+            return self._with_meta(data, "cache", key, age)
 
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "q": location,
-                    "appid": self.api_key,
-                    "units": "metric",
-                    "lang": "zh"
-                }
+            data = await self._flight.do(key, lambda: self._fetch_current(key))
+            return self._with_meta(data, "live", key, 0.0)
+        except Exception as e:
+            logger.warning(f"Weather request for {key} failed: {e!r}")
+            stale = self.cache.get(key, max_age=self.stale_max_age)
+            if stale is not None:
+                data, age = stale
+                return self._with_meta(data, "stale_cache", key, age, error=str(e))
+            return self._get_mock_weather(key, str(e))
+
+    async def _fetch_current(self, location: str) -> Dict[str, Any]:
+        params = {
+            **location_params(location),
+            "appid": self.api_key,
+            "units": "metric",
+            "lang": "zh"
+        }
+
+        response = await self.client.get(f"{self.base_url}/weather", params=params)
+        response.raise_for_status()
+        data = response.json()
+        self.cache.set(location, data)
+        return data
+
+    async def get_forecast(self, location: str = "Shanghai", hours: float = 24) -> Dict[str, Any]:
+        """Get the forecast for the next ``hours`` hours (3-hour steps)"""
+        key = normalize_location(location)
+        if not self.api_key:
+            return self._with_meta(
+                {"rows": []}, "mock", key, 0.0, error="OPENWEATHER_API_KEY not configured"
+            )
+
+        series = self.forecasts.get(key)
+        origin, error = "cache", None
+        if series is None or series.expired:
+            try:
+                series = await self._flight.do(("forecast", key), lambda: self._fetch_forecast(key))
+                origin = "live"
+            except Exception as e:
+                logger.warning(f"Forecast request for {key} failed: {e!r}")
+                if series is None:
+                    return self._with_meta({"rows": []}, "mock", key, 0.0, error=str(e))
+                origin, error = "stale_cache", str(e)
+
+        result = {
+            "city": series.city,
+            "hours": hours,
+            "rows": series.slice(hours),
+            "next_refresh_at": datetime.fromtimestamp(series.expires_at).isoformat(timespec="seconds")
+        }
+        return self._with_meta(result, origin, key, time.time() - series.fetched_at, error=error)
+
+    async def _fetch_forecast(self, location: str) -> ForecastSeries:
+        params = {
+            **location_params(location),
+            "appid": self.api_key,
+            "units": "metric",
+            "lang": "zh"
+        }
+
+        response = await self.client.get(f"{self.base_url}/forecast", params=params)
+        response.raise_for_status()
+        series = ForecastSeries.from_openweather(response.json(), self.forecast_ttl)
+        self.forecasts[location] = series
+        return series
+
+    async def get_weather_alerts(self, location: str = "Shanghai") -> Dict[str, Any]:
+        """Get active weather alerts (requires One Call API access)"""
+        key = normalize_location(location)
+        if not self.api_key:
+            return self._with_meta(
+                {"alerts": []}, "mock", key, 0.0, error="OPENWEATHER_API_KEY not configured"
+            )
+
+        cached = self.alerts_cache.get(key)
+        if cached is not None:
+            data, age = cached
+            return self._with_meta(data, "cache", key, age)
+
+        try:
+            data = await self._flight.do(("alerts", key), lambda: self._fetch_alerts(key))
+            return self._with_meta(data, "live", key, 0.0)
+        except Exception as e:
+            logger.warning(f"Alerts request for {key} failed: {e!r}")
+            return self._with_meta({"alerts": []}, "unavailable", key, 0.0, error=str(e))
+
+    async def _fetch_alerts(self, location: str) -> Dict[str, Any]:
+        # One Call needs coordinates; reuse the ones from the forecast series
+        series = self.forecasts.get(location)
+        if series is None or series.lat is None:
+            series = await self._flight.do(("forecast", location), lambda: self._fetch_forecast(location))
+
+        params = {
+            "lat": series.lat,
+            "lon": series.lon,
+            "exclude": "current,minutely,hourly,daily",
+            "appid": self.api_key,
+            "lang": "zh"
+        }
+
+        response = await self.client.get(self.onecall_url, params=params)
+        response.raise_for_status()
+        data = {"alerts": response.json().get("alerts", [])}
+        self.alerts_cache.set(location, data)
+        return data
 
-                response = await client.get(f"{self.base_url}/weather", params=params)
-                response.raise_for_status()
-                return response.json()
+    async def get_weather_batch(
+        self,
+        locations: List[Dict[str, str]],
+        forecast_hours: float = 0,
+        max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Resolve current weather (and optionally a forecast) for many locations concurrently"""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
 
-        except Exception:
-            return self._get_mock_weather()
+        async def resolve(entry: Dict[str, str]) -> Dict[str, Any]:
+            async with semaphore:
+                query = entry["query"]
+                if not forecast_hours:
+                    return {**entry, "current": await self.get_current_weather(query)}
+                current, forecast = await asyncio.gather(
+                    self.get_current_weather(query), self.get_forecast(query, forecast_hours)
+                )
+                return {**entry, "current": current, "forecast": forecast}
 
-    def _get_mock_weather(self) -> Dict[str, Any]:
-        """Mock weather data"""
-        return {
+        return await asyncio.gather(*(resolve(entry) for entry in locations))
+
+    @staticmethod
+    def _with_meta(
+        data: Dict[str, Any], origin: str, location: str, age: float, error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        meta = {
+            "origin": origin,
+            "location": location,
+            "age_seconds": round(age, 1),
+            "retrieved_at": datetime.now().isoformat(timespec="seconds")
+        }
+        if error:
+            meta["error"] = error
+        return {**data, "_meta": meta}
+
+    def _get_mock_weather(self, location: str = "shanghai", reason: Optional[str] = None) -> Dict[str, Any]:
+        """Mock weather data, clearly marked as such"""
+        data = {
             "location": "上海",
             "current": {
                 "temperature": 22,
@@ -51,24 +316,47 @@ class WeatherAPI:
                 "wind_speed": 12
             }
         }
+        return self._with_meta(data, "mock", location, 0.0, error=reason)
 
 class WeatherMCPServer(BaseMCPServer):
     """Refactored Weather MCP Server"""
 
+    # No tool_cache_policies: WeatherAPI already caches and coalesces per
+    # location, and a memoized result would freeze each location's _meta
+    # (origin, age_seconds) for the policy's whole TTL
+
+    tool_limits = {
+        "get_weather_batch": ToolLimits(max_concurrent=4, max_queue=8, timeout=30)
+    }
+
     def __init__(self):
         super().__init__("weather-mcp-server")
+        self._weather_api: Optional[WeatherAPI] = None
+        self.batch_concurrency = int(config_manager.get_env_var("WEATHER_BATCH_CONCURRENCY", "4"))
+        # Frequent locations (home, office) from aboutme/, see resources/weather_locations.json
+        self.default_locations = config_manager.load_json_config(
+            "weather_locations.json", config_dir="resources"
+        ).get("locations", [{"name": "home", "query": "39.921,116.443"}])
 
-        # Initialize Weather API
-        from utils.config import config_manager
-        api_key = config_manager.get_env_var("OPENWEATHER_API_KEY")
-        self.weather_api = WeatherAPI(api_key)
+    @property
+    def weather_api(self) -> WeatherAPI:
+        """Weather client, built on the first tool call"""
+        if self._weather_api is None:
+            self._weather_api = WeatherAPI(
+                config_manager.get_env_var("OPENWEATHER_API_KEY"),
+                client=self.http_client,
+                cache_ttl=float(config_manager.get_env_var("WEATHER_CACHE_TTL", "600")),
+                stale_max_age=float(config_manager.get_env_var("WEATHER_STALE_MAX_AGE", "10800")),
+                forecast_ttl=float(config_manager.get_env_var("WEATHER_FORECAST_TTL", "10800"))
+            )
+        return self._weather_api
 
     def get_tools(self) -> List[Tool]:
         """Return list of weather tools"""
         return [
             Tool(
                 name="get_current_weather",
-                description="Get current weather information",
+                description="Get current weather information; _meta.origin is live, cache, stale_cache or mock",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -79,6 +367,58 @@ class WeatherMCPServer(BaseMCPServer):
                         }
                     }
                 }
+            ),
+            Tool(
+                name="get_forecast",
+                description="Get the weather forecast for the next hours (3-hour steps)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "location": {
+                            "type": "string",
+                            "description": "Location name",
+                            "default": "Shanghai"
+                        },
+                        "hours": {
+                            "type": "number",
+                            "description": "Hours ahead to include (up to 120)",
+                            "default": 24
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="get_weather_alerts",
+                description="Get active weather alerts for a location",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "location": {
+                            "type": "string",
+                            "description": "Location name",
+                            "default": "Shanghai"
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="get_weather_batch",
+                description="Get weather for several locations at once (defaults to home and office)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "locations": {
+                            "type": "array",
+                            "description": "Location names or \"lat,lon\" pairs; defaults to resources/weather_locations.json",
+                            "items": {"type": "string"}
+                        },
+                        "forecast_hours": {
+                            "type": "number",
+                            "description": "Also include a forecast for this many hours (0 = current only)",
+                            "default": 0
+                        }
+                    }
+                }
             )
         ]
 
@@ -86,6 +426,12 @@ class WeatherMCPServer(BaseMCPServer):
         """Handle tool calls"""
         if name == "get_current_weather":
             return await self._get_current_weather(arguments)
+        elif name == "get_forecast":
+            return await self._get_forecast(arguments)
+        elif name == "get_weather_alerts":
+            return await self._get_weather_alerts(arguments)
+        elif name == "get_weather_batch":
+            return await self._get_weather_batch(arguments)
         else:
             return self.create_error_result(f"Unknown tool: {name}")
 
@@ -95,16 +441,52 @@ class WeatherMCPServer(BaseMCPServer):
             location = args.get("location", "Shanghai")
             weather_data = await self.weather_api.get_current_weather(location)
 
-            return CallToolResult(
-                content=[TextContent(type="text", text=json.dumps(weather_data, ensure_ascii=False, indent=2))]
+            return self.create_json_result(weather_data)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _get_forecast(self, args: Dict[str, Any]) -> CallToolResult:
+        """Get forecast implementation"""
+        try:
+            location = args.get("location", "Shanghai")
+            hours = min(float(args.get("hours", 24)), 120)
+            forecast = await self.weather_api.get_forecast(location, hours)
+
+            return self.create_json_result(forecast)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _get_weather_alerts(self, args: Dict[str, Any]) -> CallToolResult:
+        """Get weather alerts implementation"""
+        try:
+            location = args.get("location", "Shanghai")
+            alerts = await self.weather_api.get_weather_alerts(location)
+
+            return self.create_json_result(alerts)
+        except Exception as e:
+            return self.create_error_result(str(e))
+
+    async def _get_weather_batch(self, args: Dict[str, Any]) -> CallToolResult:
+        """Batch weather implementation"""
+        try:
+            if args.get("locations"):
+                locations = [{"name": name, "query": name} for name in args["locations"]]
+            else:
+                locations = self.default_locations
+            forecast_hours = min(float(args.get("forecast_hours", 0)), 120)
+
+            results = await self.weather_api.get_weather_batch(
+                locations, forecast_hours, self.batch_concurrency
             )
+
+            return self.create_json_result(results)
         except Exception as e:
             return self.create_error_result(str(e))
 
-async def main():
+async def main(transport: Optional[str] = None):
     """Main server entry point"""
     server = WeatherMCPServer()
-    await server.run()
+    await server.run(transport)
 
 if __name__ == "__main__":
     import asyncio
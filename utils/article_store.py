@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Persistent article store with full-text search
+"""
+
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    published_at TEXT NOT NULL DEFAULT '',
+    day TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_day ON articles(day);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source, day);
+"""
+
+# Text is indexed pre-tokenized (English words, Chinese bigrams) so Chinese
+# queries match without a CJK-aware SQLite tokenizer
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(tokens)"
+
+def _fts_text(article: Dict[str, Any]) -> str:
+    return " ".join(tokenize(f"{article.get('title') or ''} {article.get('description') or ''}"))
+
+def _fts_query(query: str) -> Tuple[str, List[str]]:
+    """Turn a user query into an FTS5 expression matching all of its tokens
+
+    A lone Chinese character is only indexed when it stood alone in the
+    text, so single-character tokens are returned separately for LIKE
+    matching instead of going into the expression.
+    """
+    tokens = tokenize(query)
+    chars = [token for token in tokens if len(token) == 1 and not token.isascii()]
+    expression = " AND ".join(
+        '"' + token.replace('"', '""') + '"' for token in tokens if token not in chars
+    )
+    return expression, chars
+
+class ArticleStore:
+    """SQLite article store keyed by URL with an FTS5 index
+
+    All methods are synchronous and serialized by a lock; async callers run
+    them with ``asyncio.to_thread``. When the SQLite build lacks FTS5,
+    keyword search falls back to LIKE matching.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        try:
+            self._conn.execute(FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+            self.fts_enabled = False
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def upsert_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """Insert or update articles by URL in one transaction"""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for article in articles:
+            url = article.get("url")
+            if not url:
+                continue
+            published_at = article.get("published_at") or ""
+            day = published_at[:10] if published_at[:4].isdigit() else now[:10]
+            rows.append((
+                url, article.get("title") or "", article.get("description") or "",
+                article.get("source") or "", published_at, day, now, now
+            ))
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO articles (url, title, description, source, published_at, day, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    source = excluded.source,
+                    published_at = CASE WHEN excluded.published_at != '' THEN excluded.published_at ELSE published_at END,
+                    last_seen = excluded.last_seen
+                """,
+                rows
+            )
+
+            if self.fts_enabled:
+                urls = [row[0] for row in rows]
+                placeholders = ",".join("?" * len(urls))
+                stored = self._conn.execute(
+                    f"SELECT id, title, description FROM articles WHERE url IN ({placeholders})", urls
+                ).fetchall()
+                self._conn.executemany(
+                    "DELETE FROM articles_fts WHERE rowid = ?", [(row["id"],) for row in stored]
+                )
+                self._conn.executemany(
+                    "INSERT INTO articles_fts (rowid, tokens) VALUES (?, ?)",
+                    [(row["id"], _fts_text(dict(row))) for row in stored]
+                )
+        return len(rows)
+
+    def _where(
+        self,
+        query: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        source: Optional[str]
+    ):
+        clauses, params = [], []
+        if query:
+            if self.fts_enabled:
+                expression, chars = _fts_query(query)
+                if expression:
+                    clauses.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+                    params.append(expression)
+                for char in chars:
+                    clauses.append("(a.title LIKE ? OR a.description LIKE ?)")
+                    params.extend([f"%{char}%"] * 2)
+                if not expression and not chars:
+                    # Nothing searchable in the query, e.g. only stopwords
+                    clauses.append("0")
+            else:
+                clauses.append("(a.title LIKE ? OR a.description LIKE ?)")
+                params.extend([f"%{query}%"] * 2)
+        if since:
+            clauses.append("a.day >= ?")
+            params.append(since[:10])
+        if until:
+            clauses.append("a.day <= ?")
+            params.append(until[:10])
+        if source:
+            clauses.append("a.source = ?")
+            params.append(source)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        group_by: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Search stored articles, newest first
+
+        ``since`` / ``until`` are inclusive ``YYYY-MM-DD`` dates. ``group_by``
+        ("day" or "source") adds match counts per group for trend questions.
+        """
+        where, params = self._where(query, since, until, source)
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM articles a{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT url, title, description, source, published_at, day
+                FROM articles a{where}
+                ORDER BY a.day DESC, a.published_at DESC, a.id DESC
+                LIMIT ? OFFSET ?
+                """,
+                params + [limit, offset]
+            ).fetchall()
+
+            result: Dict[str, Any] = {
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "articles": [dict(row) for row in rows]
+            }
+
+            if group_by in ("day", "source"):
+                groups = self._conn.execute(
+                    f"SELECT a.{group_by} AS grp, COUNT(*) AS n FROM articles a{where} GROUP BY a.{group_by} ORDER BY grp",
+                    params
+                ).fetchall()
+                result["counts"] = {row["grp"]: row["n"] for row in groups}
+
+        if offset + len(rows) < total:
+            result["next_offset"] = offset + len(rows)
+        return result
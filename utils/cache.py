@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+In-process async caching utilities
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key onto one in-flight call"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # key -> callers waiting in do(cancel_orphaned=True)
+        self._waiters: Dict[Hashable, int] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def start(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Return the in-flight task for key, starting func if there is none"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return task
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]], cancel_orphaned: bool = False) -> Any:
+        """Run func once for key; concurrent callers share its result or error
+
+        With ``cancel_orphaned`` the shared call is cancelled when its last
+        such caller is cancelled, instead of running on for nobody.
+        """
+        task = self.start(key, func)
+        if not cancel_orphaned:
+            # Shield so one cancelled caller does not cancel the shared call
+            return await asyncio.shield(task)
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+class TTLCache:
+    """Bounded LRU of timestamped values
+
+    ``get`` only returns entries younger than ``ttl`` unless a larger
+    ``max_age`` is passed, which lets callers fall back to stale data
+    explicitly (e.g. when the upstream is down).
+    """
+
+    def __init__(self, ttl: float = 600, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, max_age: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """Return (value, age in seconds) or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age < (self.ttl if max_age is None else max_age):
+                if max_age is None:
+                    self.hits += 1
+                self._entries.move_to_end(key)
+                return value, age
+        if max_age is None:
+            self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+class StaleWhileRevalidateCache:
+    """Async cache that serves stale entries while refreshing them
+
+    fresh  (age < fresh_ttl)           -> returned directly
+    stale  (fresh_ttl <= age < stale_ttl) -> returned directly, and a single
+                                          background refresh is started
+    expired or missing                 -> caller waits for the loader; all
+                                          concurrent callers share one load
+
+    A loader that raises stores nothing: a failed background refresh keeps
+    the stale entry, and a failed foreground load falls back to the expired
+    entry when there is one before re-raising.
+    """
+
+    def __init__(self, fresh_ttl: float = 300, stale_ttl: float = 3600, max_entries: int = 64):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flight = SingleFlight()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.served_expired = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, loading it with loader when needed"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age < self.fresh_ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._refresh_in_background(key, loader)
+                return value
+
+        self.misses += 1
+        try:
+            return await self._flight.do(key, lambda: self._load(key, loader))
+        except Exception as e:
+            if entry is None:
+                raise
+            self.served_expired += 1
+            logger.warning(f"Load of {key!r} failed, serving expired entry: {e}")
+            return entry[1]
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        if self._flight.in_flight(key):
+            return
+        self.refreshes += 1
+
+        def on_done(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                self.refresh_errors += 1
+                logger.warning(f"Background refresh of {key!r} failed: {task.exception()}")
+
+        self._flight.start(key, lambda: self._load(key, loader)).add_done_callback(on_done)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+            "background_refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "served_expired": self.served_expired,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None
+        }
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker with per-endpoint health statistics
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+class CircuitBreaker:
+    """Skip an upstream for a cool-down period after repeated failures
+
+    closed    -> requests flow; ``failure_threshold`` consecutive failures open it
+    open      -> requests are skipped until ``cooldown`` seconds have passed
+    half_open -> one trial request is let through and the rest are skipped
+                 until it reports back; success closes the breaker,
+                 failure re-opens it for another cool-down
+
+    Every ``allow()`` that returned True must be followed by
+    ``record_success``, ``record_failure`` or ``release``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 600.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+        self.successes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_error: Optional[str] = None
+        self.last_latency: Optional[float] = None
+        self.avg_latency: Optional[float] = None
+
+    def allow(self) -> bool:
+        """Return True when a request may be attempted now"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = True
+                return True
+            self.skipped += 1
+            return False
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.skipped += 1
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def release(self):
+        """Give up an allowed request without an outcome, e.g. when it was cancelled"""
+        self._trial_in_flight = False
+
+    def record_success(self, latency: Optional[float] = None):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+        if latency is not None:
+            self.last_latency = latency
+            # Exponentially weighted moving average
+            self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+
+    def record_failure(self, error: Any = None):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        self.last_error = repr(error) if error is not None else None
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return health statistics"""
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "avg_latency_ms": round(self.avg_latency * 1000, 1) if self.avg_latency is not None else None,
+            "retry_in_seconds": retry_in
+        }
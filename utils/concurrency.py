@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Admission control for tool calls: concurrency limits, bounded queues and deadlines
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+class OverloadedError(Exception):
+    """Raised instead of queueing when a limiter's queue is full"""
+
+class ToolLimits:
+    """Admission limits for one tool
+
+    max_concurrent  calls allowed to run at once; None means unlimited
+    max_queue       calls allowed to wait for a slot before new ones are
+                    rejected with OverloadedError
+    timeout         seconds from admission to result, queueing included;
+                    None falls back to the server default
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_queue: int = 0,
+        timeout: Optional[float] = None
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+class ConcurrencyLimiter:
+    """Semaphore that rejects callers once ``max_queue`` of them are waiting"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int = 0):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise OverloadedError(
+                f"Server busy: {self.active} {self.name} calls running and {self.waiting} queued "
+                f"(limit {self.max_concurrent} + {self.max_queue}), retry later"
+            )
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue
+        }
+
+class AdmissionController:
+    """Global and per-tool concurrency limits plus deadlines
+
+    A call first takes a slot in the global limiter, then in its tool's
+    limiter, and the deadline covers the time spent queueing. When the
+    deadline passes the call's task is cancelled, which aborts in-flight
+    httpx requests and returns their connections to the pool. Work handed
+    to threads (``asyncio.to_thread``) cannot be interrupted and finishes
+    in the background.
+    """
+
+    def __init__(
+        self,
+        tool_limits: Dict[str, ToolLimits],
+        max_concurrent: int,
+        max_queue: int,
+        default_timeout: Optional[float] = None
+    ):
+        self.tool_limits = tool_limits
+        self.default_timeout = default_timeout
+        self.global_limiter = ConcurrencyLimiter("concurrent", max_concurrent, max_queue)
+        self.limiters: Dict[str, ConcurrencyLimiter] = {
+            tool: ConcurrencyLimiter(tool, limits.max_concurrent, limits.max_queue)
+            for tool, limits in tool_limits.items()
+            if limits.max_concurrent is not None
+        }
+        self.timeouts = 0
+
+    async def run(self, tool: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func under the limits for tool"""
+        limits = self.tool_limits.get(tool)
+        timeout = limits.timeout if limits is not None and limits.timeout is not None else self.default_timeout
+        started = time.monotonic()
+
+        async def admitted():
+            async with self.global_limiter:
+                limiter = self.limiters.get(tool)
+                if limiter is None:
+                    return await func()
+                async with limiter:
+                    return await func()
+
+        if not timeout:
+            return await admitted()
+        try:
+            return await asyncio.wait_for(admitted(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(
+                f"{tool} did not finish within {timeout:g}s "
+                f"(gave up after {time.monotonic() - started:.1f}s) and was cancelled"
+            ) from None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "global": self.global_limiter.stats(),
+            "tools": {tool: limiter.stats() for tool, limiter in self.limiters.items()},
+            "timeouts": self.timeouts
+        }
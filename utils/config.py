@@ -43,9 +43,9 @@ class ConfigManager:
             logger.error(f"Failed to load environment: {e}")
             return False
 
-    def load_json_config(self, config_file: str) -> Dict[str, Any]:
-        """Load JSON configuration file"""
-        config_path = self.config_dir / config_file
+    def load_json_config(self, config_file: str, config_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Load JSON configuration file, from config/ unless another directory is given"""
+        config_path = (Path(config_dir) if config_dir else self.config_dir) / config_file
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate article detection with SimHash
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of text, weighted by token frequency"""
+    weights = [0] * FINGERPRINT_BITS
+    for token, count in Counter(tokenize(text)).items():
+        h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def article_fingerprint(article: Dict[str, Any]) -> int:
+    """Fingerprint an article from its title and description"""
+    return simhash(f"{article.get('title') or ''} {article.get('description') or ''}")
+
+class SimHashIndex:
+    """In-memory band index over SimHash fingerprints
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    within ``max_distance`` bits must agree exactly on at least one band, so a
+    lookup only compares against entries sharing a band value instead of
+    scanning every stored fingerprint.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self.band_count = max_distance + 1
+        self.band_bits = -(-FINGERPRINT_BITS // self.band_count)
+        self.entries: List[Dict[str, Any]] = []
+        self._bands: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(self.band_count)]
+        self._urls: Dict[str, int] = {}
+
+    def _band_values(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.band_count):
+            yield band, fingerprint >> (band * self.band_bits) & mask
+
+    def add(self, entry: Dict[str, Any]):
+        """Add an entry holding at least ``fp`` and ``url``"""
+        idx = len(self.entries)
+        self.entries.append(entry)
+        for band, value in self._band_values(entry["fp"]):
+            self._bands[band][value].append(idx)
+        if entry.get("url"):
+            self._urls[entry["url"]] = idx
+
+    def find(self, fingerprint: int, url: str = "") -> List[Tuple[Dict[str, Any], int]]:
+        """Return (entry, distance) pairs within max_distance, closest first"""
+        candidates = set()
+        if url and url in self._urls:
+            candidates.add(self._urls[url])
+        for band, value in self._band_values(fingerprint):
+            candidates.update(self._bands[band].get(value, ()))
+
+        matches = []
+        for idx in candidates:
+            entry = self.entries[idx]
+            distance = hamming_distance(fingerprint, entry["fp"])
+            if distance <= self.max_distance or (url and entry.get("url") == url):
+                matches.append((entry, distance))
+        return sorted(matches, key=lambda match: match[1])
+
+class DedupIndex:
+    """Persistent near-duplicate index covering the last ``retention_days`` days
+
+    An article is a duplicate when it is close to a different article (the
+    same story from another outlet) or to one recorded on an earlier day (a
+    repeat of yesterday's story). Seeing the same URL again on the same day
+    is not a duplicate, so repeated fetches during a day keep their results.
+    """
+
+    def __init__(self, index_path: str, retention_days: int = 7, max_distance: int = 3):
+        self.index_path = Path(index_path)
+        self.retention_days = retention_days
+        self.max_distance = max_distance
+        self.index = SimHashIndex(max_distance)
+        self._pruned_on = date.today().isoformat()
+        self._load()
+
+    def _cutoff(self) -> str:
+        return (date.today() - timedelta(days=self.retention_days)).isoformat()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries", [])
+        except Exception as e:
+            logger.warning(f"Failed to load dedup index {self.index_path}: {e}")
+            return
+
+        cutoff = self._cutoff()
+        for entry in entries:
+            if entry.get("date", "") >= cutoff:
+                self.index.add(entry)
+
+    def _prune(self):
+        """Drop entries that left the retention window, at most once a day"""
+        today = date.today().isoformat()
+        if today == self._pruned_on:
+            return
+        self._pruned_on = today
+        cutoff = self._cutoff()
+        entries = [entry for entry in self.index.entries if entry["date"] >= cutoff]
+        if len(entries) < len(self.index.entries):
+            self.index = SimHashIndex(self.max_distance)
+            for entry in entries:
+                self.index.add(entry)
+
+    def save(self):
+        """Write entries within the retention window back to disk"""
+        cutoff = self._cutoff()
+        entries = [entry for entry in self.index.entries if entry["date"] >= cutoff]
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _find_duplicate(
+        matches: List[Tuple[Dict[str, Any], int]], url: str, today: str
+    ) -> Optional[Tuple[Dict[str, Any], int]]:
+        for entry, distance in matches:
+            # Articles without a URL can only be told apart by their text
+            if not url or entry.get("url") != url or entry["date"] < today:
+                return entry, distance
+        return None
+
+    def dedupe(
+        self, articles: List[Dict[str, Any]], record: bool = True
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split articles into (unique, duplicates)
+
+        Articles are also checked against earlier articles of the same batch.
+        With ``record`` the unique ones are added to the persistent index,
+        and entries older than ``retention_days`` are dropped from memory.
+        """
+        if record:
+            self._prune()
+        today = date.today().isoformat()
+        batch = self.index if record else SimHashIndex(self.max_distance)
+        unique, duplicates = [], []
+        changed = False
+
+        for article in articles:
+            url = article.get("url") or ""
+            fingerprint = article_fingerprint(article)
+
+            matches = self.index.find(fingerprint, url)
+            if batch is not self.index:
+                matches += batch.find(fingerprint, url)
+
+            match = self._find_duplicate(matches, url, today)
+            if match is not None:
+                entry, distance = match
+                duplicates.append({
+                    "title": article.get("title", ""),
+                    "url": url,
+                    "source": article.get("source", ""),
+                    "duplicate_of": entry.get("url", ""),
+                    "duplicate_date": entry["date"],
+                    "distance": distance
+                })
+                continue
+
+            unique.append(article)
+            # Already recorded today under the same URL
+            if url and any(entry.get("url") == url for entry, _ in matches):
+                continue
+            batch.add({"fp": fingerprint, "url": url, "date": today, "title": article.get("title", "")})
+            changed = changed or record
+
+        if changed:
+            self.save()
+        return unique, duplicates
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Size-bounded on-disk JSON cache
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """On-disk key/value cache with TTL and LRU eviction
+
+    Each entry is stored as one JSON file named after the hash of its key.
+    Access order is kept in memory and mirrored to file mtimes, so the LRU
+    order survives a restart. Entries older than ``ttl`` seconds are dropped
+    on read; the cache is trimmed to ``max_entries`` and ``max_bytes`` on write.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: float = 86400,
+        max_entries: int = 256,
+        max_bytes: int = 20 * 1024 * 1024
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # file name -> size in bytes, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._index[name] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None when missing or expired"""
+        name = self._file_name(key)
+        if name not in self._index:
+            self.misses += 1
+            return None
+
+        path = self.cache_dir / name
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {name}: {e}")
+            self._remove(name)
+            self.misses += 1
+            return None
+
+        if entry.get("key") != key or time.time() - entry.get("stored_at", 0) > self.ttl:
+            self._remove(name)
+            self.misses += 1
+            return None
+
+        self._index.move_to_end(name)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry.get("value")
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store value under key and evict least recently used entries"""
+        name = self._file_name(key)
+        data = json.dumps(
+            {"key": key, "stored_at": time.time(), "value": value},
+            ensure_ascii=False
+        ).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self.cache_dir / name
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {name}: {e}")
+            return
+
+        self._total_bytes -= self._index.pop(name, 0)
+        self._index[name] = len(data)
+        self._total_bytes += len(data)
+        self._evict()
+
+    def delete(self, key: str):
+        """Remove key from the cache"""
+        name = self._file_name(key)
+        if name in self._index:
+            self._remove(name)
+
+    def clear(self):
+        """Remove every entry"""
+        for name in list(self._index):
+            self._remove(name)
+
+    def _remove(self, name: str):
+        self._total_bytes -= self._index.pop(name, 0)
+        try:
+            (self.cache_dir / name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._index and (
+            len(self._index) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            name = next(iter(self._index))
+            self._remove(name)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
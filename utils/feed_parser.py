@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Streaming RSS 2.0 / Atom feed parser
+"""
+
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterable, Dict, List, Optional
+
+ITEM_TAGS = {"item", "entry"}
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit("}", 1)[-1]
+
+def _normalize_date(value: str) -> str:
+    """Convert RFC 822 dates (RSS) to ISO 8601; Atom dates are already ISO"""
+    value = value.strip()
+    if not value or value[:4].isdigit():
+        return value
+    try:
+        return parsedate_to_datetime(value).isoformat()
+    except (TypeError, ValueError):
+        return value
+
+class FeedStreamParser:
+    """Incremental parser emitting normalized article dicts
+
+    Bytes are pushed with ``feed`` as they arrive; each completed ``<item>``
+    (RSS) or ``<entry>`` (Atom) is converted to the article dict used by
+    ``NewsAPI`` and then detached from the tree, so memory stays bounded by
+    one item instead of the whole document. Parsing stops once ``limit``
+    items have been produced.
+    """
+
+    def __init__(self, source_name: str, limit: Optional[int] = None, description_length: int = 200):
+        self.source_name = source_name
+        self.limit = limit
+        self.description_length = description_length
+        self.count = 0
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: List[ET.Element] = []
+
+    @property
+    def done(self) -> bool:
+        """True once enough items have been emitted"""
+        return self.limit is not None and self.count >= self.limit
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Consume a chunk of the document and return newly completed items"""
+        if self.done:
+            return []
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Signal end of input and return any remaining items"""
+        if self.done:
+            return []
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        articles = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+
+            self._stack.pop()
+            if _local_name(elem.tag) not in ITEM_TAGS:
+                continue
+
+            article = self._to_article(elem)
+            # Detach the finished item so the tree never grows
+            elem.clear()
+            if self._stack:
+                self._stack[-1].remove(elem)
+
+            if article is not None:
+                articles.append(article)
+                self.count += 1
+                if self.done:
+                    break
+        return articles
+
+    def _to_article(self, item: ET.Element) -> Optional[Dict[str, Any]]:
+        fields: Dict[str, str] = {}
+        link = ""
+        for child in item:
+            name = _local_name(child.tag)
+            if name == "link":
+                # Atom links carry the URL in href; prefer rel="alternate"
+                href = child.get("href")
+                if href is None:
+                    link = link or (child.text or "").strip()
+                elif child.get("rel", "alternate") == "alternate" or not link:
+                    link = href
+            elif name not in fields:
+                fields[name] = child.text or ""
+
+        title = fields.get("title")
+        if title is None or not link:
+            return None
+
+        description = fields.get("description") or fields.get("summary") or fields.get("content") or ""
+        description = description.strip()
+        if len(description) > self.description_length:
+            description = description[:self.description_length] + "..."
+
+        published = (
+            fields.get("pubDate") or fields.get("published") or
+            fields.get("updated") or fields.get("date") or ""
+        )
+
+        return {
+            "title": title.strip(),
+            "description": description,
+            "url": link,
+            "source": self.source_name,
+            "published_at": _normalize_date(published)
+        }
+
+async def parse_feed_stream(
+    chunks: AsyncIterable[bytes],
+    source_name: str,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Parse an async byte stream, stopping as soon as limit items are read"""
+    parser = FeedStreamParser(source_name, limit)
+    articles = []
+    async for chunk in chunks:
+        articles.extend(parser.feed(chunk))
+        if parser.done:
+            return articles
+    articles.extend(parser.close())
+    return articles
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client utilities
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+def create_http_client(
+    timeout: float = DEFAULT_TIMEOUT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    headers: Optional[dict] = None,
+    http2: bool = False
+) -> httpx.AsyncClient:
+    """Create a long-lived pooled AsyncClient.
+
+    The client is meant to be owned by a server and reused across tool calls
+    so keep-alive connections survive between requests. Close it with
+    ``await client.aclose()`` on shutdown. HTTP/2 is negotiated when
+    requested and the optional ``h2`` package is installed.
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("h2 package not installed, falling back to HTTP/1.1")
+            http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout),
+        limits=limits,
+        headers=headers,
+        follow_redirects=True,
+        http2=http2
+    )
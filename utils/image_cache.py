@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for generated images
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def request_key(**params: Any) -> str:
+    """Hash a generation request after normalizing its parameters
+
+    Prompts are whitespace-collapsed and other string parameters are
+    lower-cased, so trivially different spellings of the same request map
+    to the same entry.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if isinstance(value, str):
+            value = re.sub(r"\s+", " ", value).strip()
+            if name != "prompt":
+                value = value.lower()
+        normalized[name] = value
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ImageCache:
+    """On-disk image cache with a byte budget and LRU eviction
+
+    Each entry is a ``<key>.json`` metadata file plus the downloaded image
+    next to it. Both count towards ``max_bytes``; the least recently used
+    entries are evicted once the budget is exceeded. As with ``DiskCache``
+    the access order is mirrored to the metadata files' mtimes so it
+    survives a restart.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> bytes used by metadata and image, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                size = path.stat().st_size + (self.cache_dir / metadata["image_file"]).stat().st_size
+            except Exception as e:
+                logger.warning(f"Dropping incomplete image cache entry {path.name}: {e}")
+                self._remove(path.stem)
+                continue
+            entries.append((path.stat().st_mtime, path.stem, size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata for key (with ``image_path``), or None"""
+        if key not in self._index:
+            self.misses += 1
+            return None
+
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            image_path = self.cache_dir / metadata["image_file"]
+            if not image_path.exists():
+                raise FileNotFoundError(image_path.name)
+            os.utime(path)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable image cache entry {key}: {e}")
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._index.move_to_end(key)
+        self.hits += 1
+        metadata["image_path"] = str(image_path.resolve())
+        return metadata
+
+    async def put(
+        self,
+        key: str,
+        metadata: Dict[str, Any],
+        chunks: AsyncIterator[bytes],
+        extension: str = "png"
+    ) -> Optional[Dict[str, Any]]:
+        """Stream an image to disk and store it with its metadata
+
+        Returns the stored metadata, or None when the entry alone is larger
+        than the whole budget.
+        """
+        image_file = f"{key}.{extension.lstrip('.') or 'png'}"
+        image_path = self.cache_dir / image_file
+        tmp_path = image_path.with_suffix(".part")
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        break
+                    f.write(chunk)
+            if size > self.max_bytes:
+                tmp_path.unlink(missing_ok=True)
+                return None
+            os.replace(tmp_path, image_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        metadata = {**metadata, "image_file": image_file, "image_bytes": size, "stored_at": time.time()}
+        data = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+        path = self.cache_dir / f"{key}.json"
+        with open(path.with_suffix(".tmp"), 'wb') as f:
+            f.write(data)
+        os.replace(path.with_suffix(".tmp"), path)
+
+        self._total_bytes -= self._index.pop(key, 0)
+        self._index[key] = size + len(data)
+        self._total_bytes += size + len(data)
+        self._evict()
+        metadata["image_path"] = str(image_path.resolve())
+        return metadata
+
+    def _remove(self, key: str):
+        self._total_bytes -= self._index.pop(key, 0)
+        for path in self.cache_dir.glob(f"{key}.*"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self):
+        # The newest entry is last and always fits on its own
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key = next(iter(self._index))
+            self._remove(key)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None
+        }
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tool and upstream request metrics with Prometheus text export
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; tool calls range from cache hits to image generations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram
+
+    Memory and recording cost are constant per series. Percentiles are
+    estimated by linear interpolation inside the bucket that holds them,
+    the same way Prometheus' ``histogram_quantile`` does, so they are only
+    as precise as the bucket layout.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One count per bucket plus the overflow (+Inf) bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i else 0.0
+                # Observations past the last bound are only known to be <= max
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max) if self.count else None
+        }
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+class MetricsRegistry:
+    """Per-tool and per-upstream-host counters and latency histograms
+
+    Tool calls are recorded by ``BaseMCPServer``'s call_tool wrapper;
+    upstream requests by httpx event hooks installed with ``instrument``.
+    Upstream series are keyed by host rather than URL to keep the number
+    of series bounded.
+    """
+
+    def __init__(self, server_name: str):
+        self.server_name = server_name
+        self.started_at = time.time()
+        self.tool_calls: Dict[str, int] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.tool_latency: Dict[str, Histogram] = {}
+        # Rejected by the inbound rate limit; never counted as calls
+        self.tool_rate_limited: Dict[str, int] = {}
+        # (host, status class) -> count, status class is "2xx", "4xx", ...
+        self.upstream_requests: Dict[Tuple[str, str], int] = {}
+        self.upstream_latency: Dict[str, Histogram] = {}
+
+    def observe_tool(self, tool: str, seconds: float, error: bool = False):
+        self.tool_calls[tool] = self.tool_calls.get(tool, 0) + 1
+        if error:
+            self.tool_errors[tool] = self.tool_errors.get(tool, 0) + 1
+        histogram = self.tool_latency.get(tool)
+        if histogram is None:
+            histogram = self.tool_latency[tool] = Histogram()
+        histogram.observe(seconds)
+
+    def observe_rate_limited(self, tool: str):
+        self.tool_rate_limited[tool] = self.tool_rate_limited.get(tool, 0) + 1
+
+    def observe_upstream(self, host: str, status: int, seconds: float):
+        key = (host, f"{status // 100}xx")
+        self.upstream_requests[key] = self.upstream_requests.get(key, 0) + 1
+        histogram = self.upstream_latency.get(host)
+        if histogram is None:
+            histogram = self.upstream_latency[host] = Histogram()
+        histogram.observe(seconds)
+
+    def instrument(self, client: httpx.AsyncClient):
+        """Time every request made through client
+
+        The duration runs from sending the request to receiving the
+        response headers, so streamed bodies are not included. Requests that
+        fail without a response (timeouts, connection errors) are not
+        recorded here; they surface as tool errors.
+        """
+        async def on_request(request: httpx.Request):
+            request.extensions["metrics_started"] = time.perf_counter()
+
+        async def on_response(response: httpx.Response):
+            started = response.request.extensions.get("metrics_started")
+            if started is not None:
+                self.observe_upstream(response.request.url.host, response.status_code, time.perf_counter() - started)
+
+        client.event_hooks["request"].append(on_request)
+        client.event_hooks["response"].append(on_response)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current metrics as a JSON-serializable dict"""
+        upstream: Dict[str, Dict[str, Any]] = {}
+        for host, histogram in self.upstream_latency.items():
+            upstream[host] = {
+                "requests": histogram.count,
+                "by_status": {
+                    status: count for (key_host, status), count in sorted(self.upstream_requests.items())
+                    if key_host == host
+                },
+                **histogram.summary()
+            }
+        return {
+            "server": self.server_name,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "tools": {
+                tool: {
+                    "calls": self.tool_calls[tool],
+                    "errors": self.tool_errors.get(tool, 0),
+                    **histogram.summary()
+                }
+                for tool, histogram in sorted(self.tool_latency.items())
+            },
+            "rate_limited": dict(sorted(self.tool_rate_limited.items())),
+            "upstream": upstream
+        }
+
+    def _histogram_lines(self, name: str, histogram: Histogram, **labels: str):
+        cumulative = 0
+        bounds = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, histogram.counts):
+            cumulative += count
+            yield f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}"
+        yield f"{name}_sum{_labels(**labels)} {histogram.sum:.6f}"
+        yield f"{name}_count{_labels(**labels)} {histogram.count}"
+
+    def render_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format"""
+        server = self.server_name
+        lines = [
+            "# HELP mcp_uptime_seconds Seconds since the server started",
+            "# TYPE mcp_uptime_seconds gauge",
+            f"mcp_uptime_seconds{_labels(server=server)} {time.time() - self.started_at:.1f}",
+            "# HELP mcp_tool_calls_total Tool calls",
+            "# TYPE mcp_tool_calls_total counter"
+        ]
+        lines += [f"mcp_tool_calls_total{_labels(server=server, tool=tool)} {count}" for tool, count in sorted(self.tool_calls.items())]
+        lines += ["# HELP mcp_tool_errors_total Tool calls that raised or returned an error", "# TYPE mcp_tool_errors_total counter"]
+        lines += [f"mcp_tool_errors_total{_labels(server=server, tool=tool)} {count}" for tool, count in sorted(self.tool_errors.items())]
+        lines += ["# HELP mcp_tool_rate_limited_total Tool calls rejected by the inbound rate limit", "# TYPE mcp_tool_rate_limited_total counter"]
+        lines += [f"mcp_tool_rate_limited_total{_labels(server=server, tool=tool)} {count}" for tool, count in sorted(self.tool_rate_limited.items())]
+        lines += ["# HELP mcp_tool_duration_seconds Tool call latency", "# TYPE mcp_tool_duration_seconds histogram"]
+        for tool, histogram in sorted(self.tool_latency.items()):
+            lines += self._histogram_lines("mcp_tool_duration_seconds", histogram, server=server, tool=tool)
+        lines += ["# HELP mcp_upstream_requests_total Upstream HTTP requests", "# TYPE mcp_upstream_requests_total counter"]
+        lines += [
+            f"mcp_upstream_requests_total{_labels(server=server, host=host, status=status)} {count}"
+            for (host, status), count in sorted(self.upstream_requests.items())
+        ]
+        lines += ["# HELP mcp_upstream_duration_seconds Upstream time to response headers", "# TYPE mcp_upstream_duration_seconds histogram"]
+        for host, histogram in sorted(self.upstream_latency.items()):
+            lines += self._histogram_lines("mcp_upstream_duration_seconds", histogram, server=server, host=host)
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str):
+        """Write the Prometheus text atomically, e.g. for node_exporter's textfile collector"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    async def write_periodically(self, path: str, interval: float):
+        """Rewrite the metrics file every interval seconds until cancelled"""
+        try:
+            while True:
+                try:
+                    self.write_file(path)
+                except OSError as e:
+                    logger.warning(f"Failed to write metrics to {path}: {e}")
+                await asyncio.sleep(interval)
+        finally:
+            # Leave the final counts behind on shutdown
+            try:
+                self.write_file(path)
+            except OSError:
+                pass
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Serve the Prometheus text over plain HTTP on host:port"""
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), 5)
+                # Drain the headers; the request body, if any, is ignored
+                while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode("latin-1").split()
+                if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] in ("/", "/metrics"):
+                    status, body = "200 OK", self.render_prometheus().encode("utf-8")
+                else:
+                    status, body = "404 Not Found", b"not found\n"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body
+                )
+                await writer.drain()
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
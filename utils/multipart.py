@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Streaming multipart/form-data encoding
+"""
+
+import uuid
+from typing import AsyncIterator, Dict, Optional
+
+class StreamingMultipart:
+    """multipart/form-data body that streams one file part from an async iterator
+
+    httpx's own multipart support needs a file-like object; this encoder
+    takes the file as an async chunk iterator instead, so a download can be
+    piped into an upload without holding the file in memory. When the file
+    size is known the total body length is computed up front, letting the
+    request carry a Content-Length instead of chunked transfer encoding.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        file_field: str,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str = "application/octet-stream",
+        file_size: Optional[int] = None
+    ):
+        self.boundary = uuid.uuid4().hex
+        self.chunks = chunks
+        self.file_size = file_size
+
+        head = b"".join(
+            self._part_header(f'name="{name}"') + value.encode("utf-8") + b"\r\n"
+            for name, value in fields.items()
+        )
+        head += self._part_header(f'name="{file_field}"; filename="{filename}"', content_type)
+        self._head = head
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+
+    def _part_header(self, disposition: str, content_type: Optional[str] = None) -> bytes:
+        header = f"--{self.boundary}\r\nContent-Disposition: form-data; {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self.boundary}"}
+        if self.file_size is not None:
+            headers["Content-Length"] = str(len(self._head) + self.file_size + len(self._tail))
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._head
+        async for chunk in self.chunks:
+            if chunk:
+                yield chunk
+        yield self._tail
+
+async def iter_file(path: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Yield a local file in chunks"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
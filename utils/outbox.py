@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Durable outbound delivery queue
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+class RetryableError(Exception):
+    """Delivery failed but may succeed on a later attempt"""
+
+class PermanentDeliveryError(Exception):
+    """Delivery was rejected and retrying it cannot help"""
+
+class DeliveryQueue:
+    """Disk-spooled outbound queue with rate limiting and retries
+
+    Each delivery is written to ``spool_dir`` as one JSON file before
+    ``enqueue`` returns, and rewritten on every state change, so pending
+    deliveries are picked up again after a restart. Workers take a token
+    from the shared bucket before each attempt.
+
+    Delivery is at-least-once: an attempt that times out, returns an
+    unreadable response or is cut off by a restart may already have been
+    delivered, and is retried anyway. ``send(payload, delivery_id)`` gets
+    the same delivery id on every attempt, so the receiving API can use it
+    as an idempotency key to drop the duplicates. ``send`` returns a result
+    dict on success, raises ``PermanentDeliveryError`` for failures that
+    retrying cannot fix, and ``RetryableError`` or any other exception
+    (network errors, unparseable responses) to retry with jittered
+    exponential backoff.
+
+    States: queued -> sending -> delivered | retrying | failed
+
+    Delivered and failed records are kept for ``retention`` seconds so their
+    status can still be queried, then dropped from memory and disk.
+    """
+
+    TERMINAL = ("delivered", "failed")
+
+    def __init__(
+        self,
+        spool_dir: str,
+        send: Callable[[Dict[str, Any], str], Awaitable[Dict[str, Any]]],
+        limiter: Optional[TokenBucket] = None,
+        workers: int = 2,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        retention: float = 86400
+    ):
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.send = send
+        self.limiter = limiter
+        self.worker_count = max(1, workers)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retention = retention
+
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._timers: List[asyncio.TimerHandle] = []
+        self._pruned_at = 0.0
+        self._load_spool()
+
+    def _load_spool(self):
+        for path in self.spool_dir.glob("*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable spool file {path.name}: {e}")
+                continue
+            if record["status"] == "sending":
+                # Interrupted mid-attempt by a restart
+                record["status"] = "retrying"
+            self.records[record["id"]] = record
+        self._prune()
+
+    def _prune(self):
+        """Drop finished records older than the retention window"""
+        now = time.time()
+        self._pruned_at = now
+        expired = [
+            delivery_id for delivery_id, record in self.records.items()
+            if record["status"] in self.TERMINAL and record["updated_at"] < now - self.retention
+        ]
+        for delivery_id in expired:
+            del self.records[delivery_id]
+            (self.spool_dir / f"{delivery_id}.json").unlink(missing_ok=True)
+
+    def _persist(self, record: Dict[str, Any]):
+        record["updated_at"] = time.time()
+        path = self.spool_dir / f"{record['id']}.json"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def start(self):
+        """Start workers inside the running event loop (idempotent)
+
+        Called on first enqueue; call it at startup to resume deliveries
+        spooled by a previous run.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        for record in sorted(self.records.values(), key=lambda record: record["created_at"]):
+            if record["status"] not in self.TERMINAL:
+                self._schedule(record)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    def _schedule(self, record: Dict[str, Any]):
+        delay = record.get("next_attempt_at", 0) - time.time()
+        if delay > 0:
+            loop = asyncio.get_running_loop()
+            self._timers = [timer for timer in self._timers if timer.when() > loop.time()]
+            self._timers.append(loop.call_later(delay, self._queue.put_nowait, record["id"]))
+        else:
+            self._queue.put_nowait(record["id"])
+
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        """Spool a payload for delivery and return its delivery id"""
+        self.start()
+        now = time.time()
+        record = {
+            "id": uuid.uuid4().hex,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+            "next_attempt_at": 0,
+            "last_error": None,
+            "result": None
+        }
+        self.records[record["id"]] = record
+        self._persist(record)
+        self._queue.put_nowait(record["id"])
+        return record["id"]
+
+    def status(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        """Return a delivery record without its payload"""
+        record = self.records.get(delivery_id)
+        if record is None:
+            return None
+        return {key: value for key, value in record.items() if key != "payload"}
+
+    def summary(self) -> Dict[str, int]:
+        """Count deliveries per status"""
+        counts: Dict[str, int] = {}
+        for record in self.records.values():
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
+
+    async def wait(self, delivery_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until a delivery reaches a terminal state (or timeout) and return its status"""
+        record = self.records[delivery_id]
+        if record["status"] not in self.TERMINAL:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(delivery_id, []).append(future)
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.status(delivery_id)
+
+    def _finish(self, record: Dict[str, Any]):
+        self._persist(record)
+        for future in self._waiters.pop(record["id"], []):
+            if not future.done():
+                future.set_result(None)
+        # A long-running server would otherwise keep every finished record
+        if time.time() - self._pruned_at > 60:
+            self._prune()
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+
+    async def _worker(self):
+        while True:
+            delivery_id = await self._queue.get()
+            record = self.records.get(delivery_id)
+            if record is None or record["status"] in self.TERMINAL:
+                continue
+
+            if self.limiter is not None:
+                await self.limiter.acquire()
+
+            record["status"] = "sending"
+            record["attempts"] += 1
+            self._persist(record)
+
+            try:
+                record["result"] = await self.send(record["payload"], record["id"])
+                record["status"] = "delivered"
+                record["last_error"] = None
+            except PermanentDeliveryError as e:
+                record["status"] = "failed"
+                record["last_error"] = str(e)
+            except Exception as e:
+                record["last_error"] = f"{type(e).__name__}: {e}"
+                if record["attempts"] >= self.max_attempts:
+                    record["status"] = "failed"
+                else:
+                    record["status"] = "retrying"
+                    record["next_attempt_at"] = time.time() + self._backoff(record["attempts"])
+                    self._persist(record)
+                    self._schedule(record)
+                    continue
+
+            self._finish(record)
+
+    async def aclose(self):
+        """Stop workers; undelivered messages stay spooled for the next start"""
+        for timer in self._timers:
+            timer.cancel()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
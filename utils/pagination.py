@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Cursor-based pagination over snapshots of list results
+"""
+
+import json
+import uuid
+import base64
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from utils.cache import TTLCache
+
+class CursorPaginator:
+    """Serve a list result page by page from a server-side snapshot
+
+    The first request computes the full list; when it does not fit in one
+    page the list is kept for ``ttl`` seconds and the response carries an
+    opaque ``next_cursor``. Follow-up requests only pass the cursor and are
+    answered from the snapshot, so pages stay consistent even when the
+    underlying data, or side effects such as dedupe recording, would change
+    a recomputed list.
+    """
+
+    def __init__(self, ttl: float = 600, max_entries: int = 64):
+        self.snapshots = TTLCache(ttl=ttl, max_entries=max_entries)
+
+    @staticmethod
+    def encode_cursor(snapshot_id: str, offset: int, page_size: int) -> str:
+        payload = json.dumps({"s": snapshot_id, "o": offset, "n": page_size}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return {"s": str(payload["s"]), "o": int(payload["o"]), "n": int(payload["n"])}
+        except Exception:
+            raise ValueError("Invalid cursor") from None
+
+    async def paginate(
+        self,
+        load: Callable[[], Awaitable[List[Any]]],
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None
+    ) -> Union[List[Any], Dict[str, Any]]:
+        """Return one page as {"items", "total", "next_cursor"}
+
+        Without a cursor or page_size the full list is returned unchanged,
+        so tools keep their unpaged output unless a client asks for pages.
+        """
+        if cursor:
+            position = self.decode_cursor(cursor)
+            cached = self.snapshots.get(position["s"])
+            if cached is None:
+                raise ValueError("Cursor expired; repeat the request without a cursor")
+            items = cached[0]
+            snapshot_id, offset = position["s"], position["o"]
+            page_size = int(page_size or position["n"])
+        else:
+            items = await load()
+            if not page_size:
+                return items
+            snapshot_id, offset = uuid.uuid4().hex, 0
+            page_size = int(page_size)
+
+        page_size = max(1, page_size)
+        page = items[offset:offset + page_size]
+        next_offset = offset + len(page)
+        next_cursor = None
+        if next_offset < len(items):
+            if not cursor:
+                self.snapshots.set(snapshot_id, items)
+            next_cursor = self.encode_cursor(snapshot_id, next_offset, page_size)
+        return {"items": page, "total": len(items), "next_cursor": next_cursor}
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Batch relevance ranking for news articles
+"""
+
+import re
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Topics the news assistant always cares about, on top of the profile
+DEFAULT_INTEREST_KEYWORDS = ["AI", "人工智能", "GPT", "Claude", "大模型", "LLM"]
+
+# Profile fields that describe reading and learning interests
+PROFILE_INTEREST_FIELDS = ("知识兴趣", "阅读偏好", "技能发展")
+
+_PROFILE_FIELD_RE = re.compile(r"\*\*(?P<field>[^*]+)\*\*\s*[:：]\s*(?P<value>.+)")
+_KEYWORD_SPLIT_RE = re.compile(r"[、,，/／+&＋;；]|与|和|及")
+
+def load_profile_keywords(profile_path: str = "aboutme/profile.md") -> List[str]:
+    """Extract interest keywords from the personal profile"""
+    path = Path(profile_path)
+    if not path.exists():
+        logger.warning(f"Profile {profile_path} not found, using default interests only")
+        return []
+
+    keywords = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        match = _PROFILE_FIELD_RE.search(line)
+        if not match or match.group("field").strip() not in PROFILE_INTEREST_FIELDS:
+            continue
+        for keyword in _KEYWORD_SPLIT_RE.split(match.group("value")):
+            keyword = keyword.strip(" 。.")
+            # Drop verb prefixes such as "提升深度学习" -> "深度学习"
+            keyword = re.sub(r"^(提升|加强|提高)", "", keyword)
+            if keyword:
+                keywords.append(keyword)
+    return keywords
+
+def _parse_published_at(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 string or a Unix timestamp; anything else is undated"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Timestamps past the year 33658 in seconds are taken as milliseconds
+        seconds = value / 1000.0 if value > 1e12 else value
+        try:
+            return datetime.fromtimestamp(seconds, tz=timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+class RelevanceRanker:
+    """BM25 relevance ranking against interest keywords
+
+    Interest terms are tokenized and indexed once at construction; ranking a
+    batch builds a (documents x interest terms) frequency matrix and scores
+    every article with vectorized BM25. The relevance score is multiplied by
+    a per-source weight and an exponential recency decay:
+
+        score = bm25 * source_weight * (1 - recency_weight + recency_weight * 0.5 ** (age_hours / half_life))
+
+    Articles without a usable publish time get the median decay of the
+    dated articles in the batch (0.5 when none are dated), so a missing
+    date neither boosts nor buries them.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        source_weights: Optional[Dict[str, float]] = None,
+        half_life_hours: float = 24.0,
+        recency_weight: float = 0.5,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        self.source_weights = dict(source_weights or {})
+        self.half_life_hours = half_life_hours
+        self.recency_weight = recency_weight
+        self.k1 = k1
+        self.b = b
+
+        # Precomputed profile side: term -> column, plus per-term query weights
+        self.vocabulary: Dict[str, int] = {}
+        counts: List[float] = []
+        for keyword in keywords:
+            for term in tokenize(keyword):
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = len(counts)
+                    counts.append(0.0)
+                counts[self.vocabulary[term]] += 1.0
+        self.query_weights = np.asarray(counts, dtype=np.float64)
+
+    @classmethod
+    def from_profile(cls, profile_path: str = "aboutme/profile.md", **kwargs) -> "RelevanceRanker":
+        """Build a ranker from default interests plus the personal profile"""
+        keywords = DEFAULT_INTEREST_KEYWORDS + load_profile_keywords(profile_path)
+        return cls(keywords, **kwargs)
+
+    def score(
+        self,
+        articles: List[Dict[str, Any]],
+        now: Optional[datetime] = None,
+        source_weights: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """Return one relevance score per article
+
+        ``source_weights`` overrides the configured weights for this call only.
+        """
+        n_docs, n_terms = len(articles), len(self.vocabulary)
+        if n_docs == 0:
+            return np.zeros(0)
+
+        tf = np.zeros((n_docs, n_terms), dtype=np.float64)
+        doc_len = np.zeros(n_docs, dtype=np.float64)
+        weights = np.ones(n_docs, dtype=np.float64)
+        age_hours = np.zeros(n_docs, dtype=np.float64)
+        dated = np.zeros(n_docs, dtype=bool)
+        now = now or datetime.now(timezone.utc)
+        source_weights = {**self.source_weights, **source_weights} if source_weights else self.source_weights
+
+        for row, article in enumerate(articles):
+            tokens = tokenize(f"{article.get('title') or ''} {article.get('description') or ''}")
+            doc_len[row] = len(tokens)
+            for token in tokens:
+                col = self.vocabulary.get(token)
+                if col is not None:
+                    tf[row, col] += 1.0
+
+            weights[row] = source_weights.get(article.get("source", ""), 1.0)
+            published = _parse_published_at(article.get("published_at"))
+            if published is not None:
+                age_hours[row] = max((now - published).total_seconds() / 3600.0, 0.0)
+                dated[row] = True
+
+        # BM25 with document statistics taken from the candidate batch
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        avg_len = max(doc_len.mean(), 1.0)
+        norm = self.k1 * (1.0 - self.b + self.b * doc_len / avg_len)
+        bm25 = (tf * (self.k1 + 1.0) / (tf + norm[:, None])) @ (idf * self.query_weights)
+
+        decay = np.power(0.5, age_hours / self.half_life_hours)
+        if not dated.all():
+            decay[~dated] = np.median(decay[dated]) if dated.any() else 0.5
+        recency = 1.0 - self.recency_weight + self.recency_weight * decay
+        return bm25 * weights * recency
+
+    def rank(
+        self,
+        articles: List[Dict[str, Any]],
+        top_k: Optional[int] = None,
+        now: Optional[datetime] = None,
+        source_weights: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return articles sorted by score (best first) with a ``relevance_score`` field"""
+        scores = self.score(articles, now, source_weights)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return [
+            {**articles[i], "relevance_score": round(float(scores[i]), 4)}
+            for i in order
+        ]
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Rate limiting utilities
+"""
+
+import time
+import asyncio
+from typing import Optional
+
+class RateLimitedError(Exception):
+    """Raised when an inbound call finds the rate limit bucket empty"""
+
+class TokenBucket:
+    """Token bucket allowing ``rate_per_minute`` requests with bursts up to ``burst``"""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute // 6)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the next token is available"""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self.tokens) / self.rate)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+JSON encoding for tool results
+"""
+
+import json
+import logging
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def dumps(data: Any, compact: bool = True, backend: str = "auto") -> str:
+    """Serialize data to JSON text, keeping non-ASCII characters as-is
+
+    compact drops indentation and the spaces after separators. backend
+    "auto" uses orjson when it is installed and the standard library
+    otherwise; "json" forces the standard library. Values JSON cannot
+    represent are converted with ``str``, as both backends would otherwise
+    raise.
+    """
+    if orjson is not None and backend != "json":
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=str, option=option).decode("utf-8")
+    if backend == "orjson":
+        logger.warning("orjson not installed, falling back to json")
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=str)
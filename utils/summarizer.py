@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Extractive summarization for mixed Chinese / English articles
+"""
+
+import os
+import re
+import math
+import asyncio
+import hashlib
+import logging
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.text import strip_html, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Break after Chinese/English terminal punctuation (plus closing quotes);
+# an English period only ends a sentence when followed by whitespace
+_SENTENCE_END_RE = re.compile(r"(?<=[。！？!?；;…])[”’\"')）]*\s*|(?<=\.)\s+(?=[A-Z0-9一-鿿\"“(（])")
+
+_ABBREVIATION_RE = re.compile(r"\b(?:Mr|Mrs|Ms|Dr|Prof|St|Jr|Sr|Inc|Ltd|Co|Corp|vs|etc|e\.g|i\.e|U\.S)\.$")
+_CJK_END = "。！？；…”’）"
+
+def split_sentences(text: str) -> List[str]:
+    """Split mixed Chinese / English text into sentences"""
+    text = re.sub(r"\s+", " ", strip_html(text)).strip()
+    sentences: List[str] = []
+    for sentence in _SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        # Re-join splits made after abbreviations such as "Dr."
+        if sentences and _ABBREVIATION_RE.search(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {sentence}"
+        else:
+            sentences.append(sentence)
+    return sentences
+
+def _join_sentences(sentences: List[str]) -> str:
+    """Join sentences, adding spaces only after non-Chinese punctuation"""
+    text = ""
+    for sentence in sentences:
+        if text and not text.endswith(tuple(_CJK_END)):
+            text += " "
+        text += sentence
+    return text
+
+def summarize_text(text: str, title: str = "", max_length: int = 200) -> str:
+    """Pick the highest scoring sentences, in original order, within max_length
+
+    Term weights are term frequencies across the article with title terms
+    counted double; a sentence scores the summed weight of its distinct
+    terms divided by the square root of its length, and the lead sentence
+    gets a small bonus.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return title[:max_length]
+
+    sentence_tokens = [tokenize(sentence) for sentence in sentences]
+    weights = Counter(token for tokens in sentence_tokens for token in tokens)
+    for token in tokenize(title):
+        weights[token] += 2
+
+    scored = []
+    for idx, tokens in enumerate(sentence_tokens):
+        score = sum(weights[token] for token in set(tokens)) / math.sqrt(len(tokens) + 1)
+        if idx == 0:
+            score *= 1.2
+        scored.append((score, idx))
+
+    chosen, length = [], 0
+    for _, idx in sorted(scored, key=lambda item: (-item[0], item[1])):
+        sentence_length = len(sentences[idx])
+        if length + sentence_length > max_length:
+            continue
+        chosen.append(idx)
+        length += sentence_length
+
+    if not chosen:
+        best = sentences[max(scored)[1]]
+        return best[:max_length] + "..." if len(best) > max_length else best
+
+    return _join_sentences([sentences[idx] for idx in sorted(chosen)])
+
+def summarize_batch(jobs: List[Tuple[str, str, int]]) -> List[str]:
+    """Summarize (title, text, max_length) jobs; runs inside worker processes"""
+    return [summarize_text(text, title, max_length) for title, text, max_length in jobs]
+
+class SummaryEngine:
+    """Batch summarizer with memoization and a process-pool path
+
+    Results are memoized by a hash of (title, text, max_length) in a bounded
+    LRU. Batches with at least ``process_threshold`` uncached articles are
+    split across a process pool so the event loop keeps serving other calls;
+    smaller batches run inline.
+    """
+
+    def __init__(self, process_threshold: int = 32, max_workers: Optional[int] = None, cache_size: int = 2048):
+        self.process_threshold = process_threshold
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @staticmethod
+    def _key(title: str, text: str, max_length: int) -> str:
+        digest = hashlib.sha1()
+        for part in (title, text, str(max_length)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def summarize_articles(self, articles: List[Dict[str, Any]], max_length: int = 200) -> List[str]:
+        """Return one summary per article"""
+        summaries: List[Optional[str]] = [None] * len(articles)
+        pending: Dict[str, List[int]] = {}
+        jobs: List[Tuple[str, str, int]] = []
+
+        for idx, article in enumerate(articles):
+            title = article.get("title") or ""
+            text = article.get("description") or ""
+            key = self._key(title, text, max_length)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                summaries[idx] = self._cache[key]
+            elif key in pending:
+                pending[key].append(idx)
+            else:
+                pending[key] = [idx]
+                jobs.append((title, text, max_length))
+
+        if jobs:
+            if len(jobs) >= self.process_threshold:
+                results = await self._run_in_pool(jobs)
+            else:
+                results = summarize_batch(jobs)
+
+            for key, result in zip(pending, results):
+                self._cache[key] = result
+                for idx in pending[key]:
+                    summaries[idx] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return summaries
+
+    async def _run_in_pool(self, jobs: List[Tuple[str, str, int]]) -> List[str]:
+        pool = self._get_pool()
+        workers = self.max_workers or os.cpu_count() or 1
+        chunk_size = -(-len(jobs) // workers)
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, summarize_batch, chunk) for chunk in chunks
+        ))
+        return [summary for chunk in results for summary in chunk]
+
+    def shutdown(self):
+        """Stop worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
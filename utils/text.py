@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared text processing utilities for mixed Chinese / English content
+"""
+
+import re
+from typing import List
+
+_TOKEN_RE = re.compile(r"[一-鿿]+|[a-zA-Z0-9]+(?:['.-][a-zA-Z0-9]+)*")
+_CJK_RE = re.compile(r"[一-鿿]")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or "
+    "that the their this to was were will with".split()
+)
+
+def strip_html(text: str) -> str:
+    """Remove HTML tags that feeds often leave in descriptions"""
+    return _TAG_RE.sub(" ", text or "")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase English words and Chinese character bigrams
+
+    Chinese has no word delimiters, so each run of CJK characters is turned
+    into overlapping bigrams ("人工智能" -> "人工", "工智", "智能"); single
+    characters are kept as-is. English stopwords are dropped.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(strip_html(text)):
+        word = match.group()
+        if _CJK_RE.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            word = word.lower()
+            if word not in ENGLISH_STOPWORDS:
+                tokens.append(word)
+    return tokens
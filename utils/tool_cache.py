@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Declarative memoization of MCP tool results
+"""
+
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from mcp.types import CallToolResult
+
+from utils.cache import SingleFlight, TTLCache
+from utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+class CachePolicy:
+    """How the results of one tool are memoized
+
+    ttl          seconds a result stays valid
+    max_entries  LRU bound, in memory and on disk
+    key_args     arguments that identify a call; None means all of them.
+                 Arguments left out must not change the result.
+    persist      also keep results on disk so they survive a restart
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 256,
+        key_args: Optional[Sequence[str]] = None,
+        persist: bool = False
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.key_args = tuple(key_args) if key_args is not None else None
+        self.persist = persist
+
+    def key(self, arguments: Dict[str, Any]) -> str:
+        """Hash the identifying arguments, independent of their order"""
+        if self.key_args is not None:
+            arguments = {name: arguments.get(name) for name in self.key_args}
+        payload = json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ToolResultCache:
+    """Per-tool LRU/TTL caches for successful tool results
+
+    Concurrent identical calls share one execution. Error results are
+    returned to every waiting caller but never stored. Stores are created
+    on a tool's first call, so declaring policies costs nothing at startup.
+    """
+
+    def __init__(self, policies: Dict[str, CachePolicy], cache_dir: Optional[str] = None):
+        self.policies = policies
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: Dict[str, TTLCache] = {}
+        self._disk: Dict[str, DiskCache] = {}
+        self._flight = SingleFlight()
+
+    def _stores(self, tool: str, policy: CachePolicy):
+        memory = self._memory.get(tool)
+        if memory is None:
+            memory = self._memory[tool] = TTLCache(ttl=policy.ttl, max_entries=policy.max_entries)
+            if policy.persist and self.cache_dir is not None:
+                self._disk[tool] = DiskCache(
+                    str(self.cache_dir / tool), ttl=policy.ttl, max_entries=policy.max_entries
+                )
+        return memory, self._disk.get(tool)
+
+    async def call(
+        self,
+        tool: str,
+        arguments: Dict[str, Any],
+        compute: Callable[[], Awaitable[CallToolResult]]
+    ) -> CallToolResult:
+        """Return the memoized result for this call, running compute on a miss"""
+        policy = self.policies.get(tool)
+        if policy is None:
+            return await compute()
+
+        key = policy.key(arguments)
+        memory, disk = self._stores(tool, policy)
+        cached = memory.get(key)
+        if cached is not None:
+            return cached[0]
+
+        if disk is not None:
+            stored = disk.get(key)
+            if stored is not None:
+                try:
+                    result = CallToolResult.model_validate(stored)
+                    memory.set(key, result)
+                    return result
+                except Exception as e:
+                    logger.warning(f"Dropping unreadable {tool} cache entry: {e}")
+                    disk.delete(key)
+
+        async def load() -> CallToolResult:
+            result = await compute()
+            if not result.isError:
+                memory.set(key, result)
+                if disk is not None:
+                    disk.set(key, result.model_dump(mode="json", exclude_none=True))
+            return result
+
+        return await self._flight.do((tool, key), load)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tool hit/miss counters"""
+        stats = {}
+        for tool, memory in self._memory.items():
+            stats[tool] = memory.stats()
+            if tool in self._disk:
+                stats[tool]["disk"] = self._disk[tool].stats()
+        stats["coalesced"] = self._flight.coalesced
+        return stats